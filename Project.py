@@ -2,386 +2,963 @@ import tkinter as tk
 from tkinter import messagebox, Toplevel, Menu, ttk, PhotoImage
 import tkinter.simpledialog as simpledialog
 from typing import Self
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.dates as mdates
-import psycopg2
+import contextvars
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import queries
+from queries import (CONTRIBUTION_HISTORY_PAGE_SIZE, DISCOVERY_PAGE_SIZE, RANK_METRIC_COLUMNS,
+                     SEARCH_RESULT_LIMIT)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d+)_(\w+)\.sql$")
+MIGRATION_LOCK_ID = 412_001  # pg advisory lock key serializing concurrent app starts
+
+LEADERBOARD_PAGE_SIZE = 100
+LEADERBOARD_LIMITS = {"top10": 10, "top50": 50, "top100": 100}
+TRANSACTIONS_PAGE_SIZE = 200
+QUERY_WORKERS = 4
+CHART_PIXELS_PER_POINT = 4
+CHART_MIN_POINTS = 50
+CHART_ZOOM_DEBOUNCE_MS = 250
+CONTRIBUTION_COMPACTION_MS = 60_000
+FILTER_DEBOUNCE_MS = 300
+SQL_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s")
+INSTRUMENTATION_EXCLUDED = {"connect", "close", "cache_stats", "apply_migrations"}
+
+query_logger = logging.getLogger("savesphere.queries")
+logger = logging.getLogger("savesphere")
+
+# psycopg2 (with libpq) and matplotlib are the slowest imports, so neither is loaded at
+# startup: load_psycopg2() runs on the first connection, off the Tk thread, and
+# TrendChart imports matplotlib when the stats view first opens. import_budget.py keeps
+# `import Project` under its cold-start budget.
+psycopg2 = None
+InstrumentedCursor = None
+_psycopg2_lock = threading.Lock()
+
+
+def load_psycopg2():
+    global psycopg2, InstrumentedCursor
+    with _psycopg2_lock:
+        if InstrumentedCursor is None:
+            import psycopg2
+            import psycopg2.extensions
+            import psycopg2.pool
+            InstrumentedCursor = make_instrumented_cursor(psycopg2.extensions.cursor)
+    return psycopg2
+
+class ConnectionPool:
+    # Bounded pool of long-lived connections. Idle connections above min_size are
+    # closed after idle_timeout seconds, and a connection that has been idle for
+    # more than ping_after seconds is checked with a round trip before reuse.
+    def __init__(self, connect, min_size=1, max_size=10, idle_timeout=300, ping_after=5, checkout_timeout=30):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Invalid pool size: min_size must be between 0 and max_size.")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.ping_after = ping_after
+        self.checkout_timeout = checkout_timeout
+        self._idle = deque()  # (connection, last_used) pairs, most recently used on the right
+        self._size = 0  # connections checked out plus idle ones
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def getconn(self):
+        deadline = time.monotonic() + self.checkout_timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise load_psycopg2().pool.PoolError("connection pool is closed")
+                self._close_expired()
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn, last_used = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise load_psycopg2().pool.PoolError("connection pool exhausted")
+                self._cond.wait(remaining)
+
+        # The slot is reserved, so connecting and health checks happen outside the lock
+        try:
+            if conn is not None and not self._is_healthy(conn, last_used):
+                self._close_quietly(conn)
+                conn = None
+            if conn is None:
+                conn = self._connect()
+            return conn
+        except BaseException:
+            self._release_slot()
+            raise
+
+    def putconn(self, conn, broken=False):
+        if not broken and not conn.closed:
+            try:
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                broken = True
+        if broken or conn.closed:
+            self._close_quietly(conn)
+            self._release_slot()
+            return
+        with self._cond:
+            if self._closed:
+                self._size -= 1
+                self._close_quietly(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.popleft()
+                self._size -= 1
+                self._close_quietly(conn)
+            self._cond.notify_all()
+
+    def _is_healthy(self, conn, last_used):
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.ping_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _close_expired(self):
+        # Called with the lock held; the oldest idle connections sit on the left
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.idle_timeout:
+            conn, _ = self._idle.popleft()
+            self._size -= 1
+            self._close_quietly(conn)
+
+    def _release_slot(self):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+
+def run_migrations(conn, directory=MIGRATIONS_DIR):
+    # Runs every migrations/NNNN_name.sql newer than what SchemaMigrations records,
+    # each in its own transaction on conn, and returns the versions applied. Works on
+    # any psycopg2 connection, so loaders that don't go through Database can use it too.
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        match = MIGRATION_FILE_PATTERN.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    migrations.sort()
+
+    applied = []
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS SchemaMigrations (
+                Version INT PRIMARY KEY,
+                Name VARCHAR(255) NOT NULL,
+                AppliedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            );
+        """)
+        conn.commit()
+
+        for version, name, path in migrations:
+            cur.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+            cur.execute("SELECT 1 FROM SchemaMigrations WHERE Version = %s", (version,))
+            if cur.fetchone():
+                conn.commit()
+                continue
+            with open(path) as migration_file:
+                cur.execute(migration_file.read())
+            cur.execute("INSERT INTO SchemaMigrations (Version, Name) VALUES (%s, %s);", (version, name))
+            conn.commit()
+            applied.append(version)
+    return applied
+
+
+ALL_ARGUMENTS = object()  # QueryCache.invalidate: drop every entry of the method
+
+
+class QueryCache:
+    # Thread-safe read-through cache for Database lookups with a TTL per entry and LRU
+    # eviction. Keys are (method name, bound arguments) and hits/misses are counted per
+    # method. Every invalidation bumps the method's generation, so a read that started
+    # before a write committed cannot store its stale result afterwards.
+    def __init__(self, max_entries=512, default_ttl=30):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value), least recently used first
+        self._generations = Counter()
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def get_or_load(self, key, load, ttl=None):
+        method = key[0]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits[method] += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses[method] += 1
+            generation = self._generations[method]
+
+        value = load()
+
+        with self._lock:
+            if self._generations[method] == generation:
+                expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, method, first_argument=ALL_ARGUMENTS):
+        # Drops the method's entries whose first argument (after self) matches, or all of them
+        with self._lock:
+            self._generations[method] += 1
+            stale = [key for key in self._entries
+                     if key[0] == method and (first_argument is ALL_ARGUMENTS or key[1][:1] == (first_argument,))]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            for method, _ in self._entries:
+                self._generations[method] += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            methods = sorted(set(self.hits) | set(self.misses))
+            return {
+                'entries': len(self._entries),
+                'hits': sum(self.hits.values()),
+                'misses': sum(self.misses.values()),
+                'methods': {method: {'hits': self.hits[method], 'misses': self.misses[method]} for method in methods},
+            }
+
+
+def cached(ttl=None):
+    # Serves a Database read from self.cache when one is configured
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.cache is None:
+                return method(self, *args, **kwargs)
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            key = (method.__name__, tuple(bound.arguments.values())[1:])
+            return self.cache.get_or_load(key, lambda: method(self, *args, **kwargs), ttl)
+        return wrapper
+    return decorator
+
+
+def invalidates(*targets):
+    # After a successful write, drops the cached reads it affects. Each target is
+    # (read method name, argument name of this write whose value is the read's first
+    # argument), or (read method name, None) to drop every entry of that read.
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            if self.cache is not None:
+                bound = signature.bind(self, *args, **kwargs)
+                for read_method, argument in targets:
+                    if argument is None:
+                        self.cache.invalidate(read_method)
+                    else:
+                        self.cache.invalidate(read_method, bound.arguments[argument])
+            return result
+        return wrapper
+    return decorator
+
+
+# Reads that change whenever any user's savings or expenses change
+LEADERBOARD_READS = (
+    ("get_savings_leaderboard_data", None),
+    ("get_expense_leaderboard_data", None),
+    ("get_net_worth_leaderboard_data", None),
+    ("get_user_rank", None),
+)
+TRANSACTION_WRITE_INVALIDATIONS = (
+    ("get_user_stats_snapshot", "user_id"),
+    ("get_savings_expenses_series", "user_id"),
+    ("get_savings_expenses_span", "user_id"),
+    ("get_savings_expenses_downsampled", "user_id"),
+    ("get_total_net_worth_for_user", "user_id"),
+) + LEADERBOARD_READS
+GROUP_WRITE_INVALIDATIONS = (
+    ("get_group_name", "group_id"),
+    ("get_group_goals", None),
+    ("get_groups_user_not_member_of", None),
+    ("search_groups", None),
+    ("get_group_contributions", "group_id"),
+    ("get_group_member_contributions", "group_id"),
+)
+CONTRIBUTION_WRITE_INVALIDATIONS = (
+    ("get_group_goals", None),
+    ("get_group_contributions", "group_id"),
+    ("get_group_member_contributions", "group_id"),
+)
+
+
+def fingerprint_sql(sql):
+    # Literals and placeholders become ?, so the same statement with different
+    # arguments shares one fingerprint
+    normalized = " ".join(SQL_LITERAL_PATTERN.sub("?", sql).split())
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12], normalized
+
+
+class RingBufferSink:
+    # Keeps the most recent query records in memory
+    def __init__(self, capacity=1000):
+        self._records = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        with self._lock:
+            self._records.append(record)
+
+    def records(self):
+        with self._lock:
+            return list(self._records)
+
+
+class JsonLinesSink:
+    # Appends one JSON object per query record to a file
+    def __init__(self, path):
+        self._file = open(path, "a", buffering=1)
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class QueryCall:
+    # The statements run by one instrumented Database method call. Statement
+    # parameters are kept only for EXPLAIN and never written to a sink.
+    def __init__(self, method):
+        self.method = method
+        self.pending_acquire_ms = 0.0
+        self.statements = []
+
+    def executed(self, query, params, started_at, execute_ms, rowcount):
+        self.statements.append({
+            "query": query,
+            "params": params,
+            "timestamp": started_at,
+            "acquire_ms": self.pending_acquire_ms,
+            "execute_ms": execute_ms,
+            "fetch_ms": 0.0,
+            "rowcount": rowcount,
+            "fetched": None,
+        })
+        self.pending_acquire_ms = 0.0
+
+    def fetched(self, fetch_ms, result):
+        # result is a row tuple (fetchone), None, or a list of rows
+        if self.statements:
+            statement = self.statements[-1]
+            statement["fetch_ms"] += fetch_ms
+            rows = len(result) if isinstance(result, list) else int(result is not None)
+            statement["fetched"] = (statement["fetched"] or 0) + rows
+
+
+current_query_call = contextvars.ContextVar("current_query_call", default=None)
+
+
+def make_instrumented_cursor(base):
+    class InstrumentedCursor(base):
+        # Times execute and fetch calls made inside an instrumented Database method
+        def execute(self, query, vars=None):
+            call = current_query_call.get()
+            if call is None:
+                return super().execute(query, vars)
+            started_at = time.time()
+            started = time.perf_counter()
+            try:
+                return super().execute(query, vars)
+            finally:
+                text = query if isinstance(query, str) else query.as_string(self)
+                call.executed(text, vars, started_at, (time.perf_counter() - started) * 1000, self.rowcount)
+
+        def _timed_fetch(self, fetch, *args):
+            call = current_query_call.get()
+            if call is None:
+                return fetch(*args)
+            started = time.perf_counter()
+            result = fetch(*args)
+            call.fetched((time.perf_counter() - started) * 1000, result)
+            return result
+
+        def fetchone(self):
+            return self._timed_fetch(super().fetchone)
+
+        def fetchmany(self, size=None):
+            return self._timed_fetch(super().fetchmany, size or self.arraysize)
+
+        def fetchall(self):
+            return self._timed_fetch(super().fetchall)
+
+    return InstrumentedCursor
+
+
+def instrument_methods(cls):
+    # Wraps every public Database query method so its statements are recorded
+    # when a query sink or slow-query threshold is configured
+    def instrument(name, method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if (self.query_sink is None and self.slow_query_ms is None) or current_query_call.get() is not None:
+                return method(self, *args, **kwargs)
+            call = QueryCall(name)
+            token = current_query_call.set(call)
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                current_query_call.reset(token)
+                self._record_queries(call)
+        return wrapper
 
-def open_login_window():
-    global login_window  # Ensure that we can re-open the window
-    login_window = LoginWindow(db)
-    login_window.run()
+    for name, method in list(vars(cls).items()):
+        if callable(method) and not name.startswith("_") and name not in INSTRUMENTATION_EXCLUDED:
+            setattr(cls, name, instrument(name, method))
+    return cls
 
+
+@instrument_methods
 class Database:
-    def __init__(self, dbname, user, password, host):
+    def __init__(self, dbname, user, password, host, min_connections=1, max_connections=10, idle_timeout=300,
+                 cache_size=512, cache_ttl=30, query_sink=None, slow_query_ms=None):
         self.dbname = dbname
         self.user = user
         self.password = password
         self.host = host
-
-    def connect(self):
+        self.pool = ConnectionPool(self._open_connection, min_connections, max_connections, idle_timeout)
+        self.cache = QueryCache(cache_size, cache_ttl) if cache_size else None
+        self.query_sink = query_sink
+        self.slow_query_ms = slow_query_ms
+        self.migrations_applied = False
+
+    def _open_connection(self):
+        load_psycopg2()
         return psycopg2.connect(
             dbname=self.dbname,
             user=self.user,
             password=self.password,
-            host=self.host
+            host=self.host,
+            cursor_factory=InstrumentedCursor
         )
 
+    def _record_queries(self, call):
+        for statement in call.statements:
+            fingerprint, sql = fingerprint_sql(statement["query"])
+            record = {
+                "method": call.method,
+                "fingerprint": fingerprint,
+                "sql": sql,
+                "timestamp": statement["timestamp"],
+                "acquire_ms": round(statement["acquire_ms"], 3),
+                "execute_ms": round(statement["execute_ms"], 3),
+                "fetch_ms": round(statement["fetch_ms"], 3),
+                "rows": statement["fetched"] if statement["fetched"] is not None else statement["rowcount"],
+            }
+            if self.query_sink is not None:
+                self.query_sink.write(record)
+            if self.slow_query_ms is not None and record["execute_ms"] + record["fetch_ms"] >= self.slow_query_ms:
+                self._log_slow_query(record, statement)
+
+    def _log_slow_query(self, record, statement):
+        # EXPLAIN ANALYZE runs the statement again, so it runs in a READ ONLY transaction:
+        # anything that writes (including a WITH ... INSERT or a SELECT of a writing
+        # function) fails there and falls back to a plain EXPLAIN. The connection is
+        # always rolled back, never committed, so the re-run can leave nothing behind.
+        try:
+            conn = self.pool.getconn()
+            broken = False
+            try:
+                try:
+                    plan = self._explain(conn, statement, analyze=True)
+                except psycopg2.Error:
+                    conn.rollback()
+                    plan = self._explain(conn, statement, analyze=False)
+            finally:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    broken = True
+                self.pool.putconn(conn, broken=broken or bool(conn.closed))
+        except Exception as e:
+            plan = f"EXPLAIN failed: {e}"
+        query_logger.warning("Slow query in %s (%.1f ms execute, %.1f ms fetch, %s rows) [%s] %s\n%s",
+                             record["method"], record["execute_ms"], record["fetch_ms"], record["rows"],
+                             record["fingerprint"], record["sql"], plan)
+
+    def _explain(self, conn, statement, analyze):
+        with conn.cursor() as cur:
+            if analyze:
+                cur.execute("SET TRANSACTION READ ONLY")
+            cur.execute(("EXPLAIN ANALYZE " if analyze else "EXPLAIN ") + statement["query"], statement["params"])
+            return "\n".join(row[0] for row in cur.fetchall())
+
+    @contextmanager
+    def connect(self):
+        # Borrow a pooled connection; commit on success, roll back on error and
+        # hand it back. Connections that broke while in use are discarded, and the
+        # pool opens a fresh one on the next checkout.
+        call = current_query_call.get()
+        started = time.perf_counter()
+        conn = self.pool.getconn()
+        if call is not None:
+            call.pending_acquire_ms += (time.perf_counter() - started) * 1000
+        broken = False
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            if conn.closed:
+                broken = True
+            else:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    broken = True
+            raise
+        finally:
+            self.pool.putconn(conn, broken=broken or bool(conn.closed))
+
+    def close(self):
+        self.pool.close()
+
+    def cache_stats(self):
+        return self.cache.stats() if self.cache is not None else None
+
+    def apply_migrations(self, directory=MIGRATIONS_DIR):
+        with self.connect() as conn:
+            applied = run_migrations(conn, directory)
+        self.migrations_applied = True
+        return applied
+
+    @cached()
     def get_user_info(self, user_id):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT * FROM Users WHERE UserID = %s", (user_id,))
+                cur.execute(queries.USER_INFO, (user_id,))
                 return cur.fetchone()
 
     def login_user(self, email, password):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT UserID, Password FROM Users WHERE Email = %s", (email,))
+                cur.execute(queries.LOGIN_USER, (email,))
                 user_record = cur.fetchone()
                 if user_record and user_record[1] == password:
                     return user_record[0]  # Return the UserID
                 else:
                     return None
+    @cached()
     def get_user_challenges(self, user_id):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT c.ChallengeID, c.Name, c.BriefDescription, c.StartDate, c.EndDate, c.TargetAmount
-                    FROM Challenges c
-                    INNER JOIN UserChallenges uc ON c.ChallengeID = uc.ChallengeID
-                    WHERE uc.UserID = %s;
-                """, (user_id,))
+                cur.execute(queries.USER_CHALLENGES, (user_id,))
                 return cur.fetchall()
-    def get_challenges_user_not_member_of(self, user_id):
+    @cached()
+    def get_challenges_user_not_member_of(self, user_id, limit=DISCOVERY_PAGE_SIZE, after=None, prefix=None):
+        # One page of challenges the user has not joined, ordered by (lower(Name), ChallengeID).
+        # after is the (Name, ChallengeID) of the previous page's last row; prefix keeps names
+        # starting with it. Both walk idx_challenges_name_key, so a page costs the same anywhere in the list.
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT c.ChallengeID, c.Name, c.BriefDescription, c.StartDate, c.EndDate, c.TargetAmount
-                    FROM Challenges c
-                    WHERE c.ChallengeID NOT IN (
-                        SELECT ChallengeID FROM UserChallenges WHERE UserID = %s
-                    )
-                    ORDER BY c.Name;
-                """, (user_id,))
+                cur.execute(queries.challenges_not_joined_query(after, prefix),
+                            queries.discovery_parameters(user_id, limit, after, prefix))
                 return cur.fetchall()
 
+    @cached()
+    def search_challenges(self, user_id, text, limit=SEARCH_RESULT_LIMIT):
+        # Challenges the user has not joined whose name or descriptions contain every word of
+        # text as a prefix, best matches first. Rows match get_challenges_user_not_member_of.
+        query = queries.search_query(text)
+        if query is None:
+            return []
+        with self.connect() as conn:
+            with conn.cursor() as cur:
+                cur.execute(queries.SEARCH_CHALLENGES, queries.search_parameters(user_id, query, limit))
+                return cur.fetchall()
+
+    @cached()
     def get_group_goals(self, user_id):
+        # Savings are the compacted total plus contributions not yet compacted
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT g.GroupID, g.GroupName, g.GroupGoal, g.CurrentGroupSavings
-                    FROM Groups g
-                    INNER JOIN UserGroups ug ON g.GroupID = ug.GroupID
-                    WHERE ug.UserID = %s;
-                """, (user_id,))
+                cur.execute(queries.GROUP_GOALS, (user_id,))
                 return cur.fetchall()
 
-    def get_groups_user_not_member_of(self, user_id):
+    @cached()
+    def get_groups_user_not_member_of(self, user_id, limit=DISCOVERY_PAGE_SIZE, after=None, prefix=None):
+        # Same paging as get_challenges_user_not_member_of, with after = (GroupName, GroupID).
+        # Member counts come from GroupMemberCounts, kept by a trigger on UserGroups, so no page
+        # counts memberships and joining a group never updates its Groups row.
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT g.GroupID, g.GroupName, g.Description, g.GroupGoal, COUNT(ug.UserID)
-                    FROM Groups g
-                    LEFT JOIN UserGroups ug ON g.GroupID = ug.GroupID
-                    WHERE g.GroupID NOT IN (
-                        SELECT GroupID FROM UserGroups WHERE UserID = %s
-                    )
-                    GROUP BY g.GroupID
-                    ORDER BY g.GroupName;
-                """, (user_id,))
+                cur.execute(queries.groups_not_joined_query(after, prefix),
+                            queries.discovery_parameters(user_id, limit, after, prefix))
                 return cur.fetchall()
 
+    @cached()
+    def search_groups(self, user_id, text, limit=SEARCH_RESULT_LIMIT):
+        # Same as search_challenges over group names and descriptions
+        query = queries.search_query(text)
+        if query is None:
+            return []
+        with self.connect() as conn:
+            with conn.cursor() as cur:
+                cur.execute(queries.SEARCH_GROUPS, queries.search_parameters(user_id, query, limit))
+                return cur.fetchall()
+
+    @invalidates(("get_group_goals", "user_id"), ("get_groups_user_not_member_of", None), ("search_groups", None))
     def create_group(self, user_id, group_name, description, group_goal):
         with self.connect() as conn:
             with conn.cursor() as cur:
                 try:
                     # Insert the new group
-                    cur.execute("""
-                        INSERT INTO Groups (GroupName, Description, GroupGoal, CurrentGroupSavings, OwnerID) 
-                        VALUES (%s, %s, %s, 0.00, %s) RETURNING GroupID;
-                    """, (group_name, description, group_goal, user_id))
-                    group_id = cur.fetchone()[0]
+                    cur.execute(queries.CREATE_GROUP, (group_name, description, group_goal, user_id))
+                    group = cur.fetchone()
+                    group_id = group[0]
 
                     # Associate the creator with the group in UserGroups table
-                    cur.execute("""
-                        INSERT INTO UserGroups (UserID, GroupID) VALUES (%s, %s);
-                    """, (user_id, group_id))
+                    cur.execute(queries.ADD_USER_TO_GROUP, (user_id, group_id))
 
                     conn.commit()
-                    return group_id
+                    return group  # Same shape as a get_group_goals row
                 except Exception as e:
                     conn.rollback()
                     raise e
 
+    @invalidates(*GROUP_WRITE_INVALIDATIONS)
     def edit_group(self, user_id, group_id, new_group_name, new_description, new_group_goal):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                # Check if the user is the owner of the group
-                cur.execute("SELECT OwnerID FROM Groups WHERE GroupID = %s", (group_id,))
-                result = cur.fetchone()
-                if result and result[0] == user_id:
-                    cur.execute("""
-                        UPDATE Groups SET GroupName = %s, Description = %s, GroupGoal = %s 
-                        WHERE GroupID = %s;
-                    """, (new_group_name, new_description, new_group_goal, group_id))
-                    conn.commit()
-                else:
+                cur.execute(queries.EDIT_GROUP, (new_group_name, new_description, new_group_goal, group_id, user_id))
+                group = cur.fetchone()
+                if group is None:
                     raise Exception("User is not the owner of the group.")
+                conn.commit()
+                return group
 
+    @invalidates(*GROUP_WRITE_INVALIDATIONS)
     def delete_group(self, user_id, group_id):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT OwnerID FROM Groups WHERE GroupID = %s", (group_id,))
-                result = cur.fetchone()
-                if result and result[0] == user_id:
-                    cur.execute("DELETE FROM Groups WHERE GroupID = %s", (group_id,))
-                    conn.commit()
-                else:
+                cur.execute(queries.DELETE_GROUP, (group_id, user_id))
+                if cur.fetchone() is None:
                     raise Exception("User is not the owner of the group.")
+                conn.commit()
+                return group_id
 
+    @invalidates(("get_group_goals", "user_id"), ("get_groups_user_not_member_of", None), ("search_groups", None))
     def add_user_to_group(self, user_id, group_id):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("""
-                    INSERT INTO UserGroups (UserID, GroupID) VALUES (%s, %s);
-                """, (user_id, group_id))
+                cur.execute(queries.ADD_USER_TO_GROUP, (user_id, group_id))
                 conn.commit()
 
+    @invalidates(("get_user_challenges", "user_id"), ("get_challenges_user_not_member_of", "user_id"), ("search_challenges", "user_id"))
     def add_user_to_challenge(self, user_id, challenge_id):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("""
-                    INSERT INTO UserChallenges (UserID, ChallengeID) VALUES (%s, %s);
-                """, (user_id, challenge_id))
+                cur.execute(queries.ADD_USER_TO_CHALLENGE, (user_id, challenge_id))
                 conn.commit()
+    @invalidates(("get_user_challenges", "user_id"), ("get_challenges_user_not_member_of", "user_id"), ("search_challenges", "user_id"))
     def remove_user_from_challenge(self, user_id, challenge_id):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("""
-                    DELETE FROM UserChallenges WHERE UserID = %s and ChallengeID = %s;
-                """, (user_id, challenge_id))
+                cur.execute(queries.REMOVE_USER_FROM_CHALLENGE, (user_id, challenge_id))
+                result = cur.fetchone()
                 conn.commit()
-    def add_contribution_to_group(self, group_id, amount):
+                return result[0] if result else None
+    @invalidates(*CONTRIBUTION_WRITE_INVALIDATIONS)
+    def add_contribution_to_group(self, user_id, group_id, amount):
+        # Appends to the GroupContributions ledger without touching the Groups row, so
+        # contributions to the same group never queue on its row lock. Returns the group
+        # shaped like a get_group_goals row.
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("""
-                    UPDATE Groups SET CurrentGroupSavings = CurrentGroupSavings + %s WHERE GroupID = %s;
-                """, (amount, group_id))
+                cur.execute(queries.ADD_CONTRIBUTION_TO_GROUP, {"user_id": user_id, "group_id": group_id, "amount": amount})
+                group = cur.fetchone()
                 conn.commit()
+                return group
 
-    def get_group_name(self, group_id):
+    @cached()
+    def get_group_contributions(self, group_id, limit=CONTRIBUTION_HISTORY_PAGE_SIZE, before=None):
+        # One page of a group's contributions, newest first:
+        # [(ContributionID, UserID, FirstName, LastName, Amount, ContributedAt), ...].
+        # before is the ContributionID of the previous page's last row.
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT GroupName FROM Groups WHERE GroupID = %s", (group_id,))
-                result = cur.fetchone()
-                return result[0] if result else None
+                cur.execute(queries.GROUP_CONTRIBUTIONS, {"group_id": group_id, "limit": limit, "before": before})
+                return cur.fetchall()
 
-    def get_savings_leaderboard_data(self):
+    @cached()
+    def get_group_member_contributions(self, group_id):
+        # [(UserID, FirstName, LastName, Total, Contributions), ...] for everyone who has
+        # contributed to the group, largest total first
         with self.connect() as conn:
             with conn.cursor() as cur:
-                # SQL query to fetch user details and their total savings
-                query = """
-                SELECT u.UserID, u.FirstName, u.LastName, COALESCE(SUM(s.Amount), 0) AS TotalSavings
-                FROM Users u
-                LEFT JOIN Savings s ON u.UserID = s.UserID
-                GROUP BY u.UserID
-                ORDER BY TotalSavings DESC;
-                """
-                cur.execute(query)
+                cur.execute(queries.GROUP_MEMBER_CONTRIBUTIONS, (group_id,))
                 return cur.fetchall()
-            
-    def get_expense_leaderboard_data(self):
+
+    def compact_group_contributions(self, batch_size=10000):
+        # Folds pending ledger rows into Groups.CurrentGroupSavings; live totals are unchanged,
+        # so nothing cached needs invalidating. Returns the number of rows folded.
         with self.connect() as conn:
             with conn.cursor() as cur:
-                # SQL query to fetch user details and their total savings
-                query = """
-                SELECT u.UserID, u.FirstName, u.LastName, COALESCE(SUM(e.Amount), 0) AS TotalExpense
-                FROM Users u
-                LEFT JOIN Expenses e ON u.UserID = e.UserID
-                GROUP BY u.UserID
-                ORDER BY TotalExpense DESC
-                """
-                cur.execute(query)
-                return cur.fetchall()
-            
-    def get_net_worth_leaderboard_data(self):
+                cur.execute(queries.COMPACT_GROUP_CONTRIBUTIONS, (batch_size,))
+                folded = cur.fetchone()[0]
+                conn.commit()
+                return folded
+
+    @cached()
+    def get_group_name(self, group_id):
+        with self.connect() as conn:
+            with conn.cursor() as cur:
+                cur.execute(queries.GROUP_NAME, (group_id,))
+                result = cur.fetchone()
+                return result[0] if result else None
+
+    def _get_leaderboard(self, total_column, limit, offset):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                query = """
-                WITH TotalSavings AS (
-                    SELECT UserID, COALESCE(SUM(Amount), 0) AS SavingsTotal
-                    FROM Savings
-                    GROUP BY UserID
-                ),
-                TotalExpenses AS (
-                    SELECT UserID, COALESCE(SUM(Amount), 0) AS ExpensesTotal
-                    FROM Expenses
-                    GROUP BY UserID
-                )
-                SELECT u.UserID, u.FirstName, u.LastName, 
-                       COALESCE(ts.SavingsTotal, 0) - COALESCE(te.ExpensesTotal, 0) AS NetWorth
-                FROM Users u
-                LEFT JOIN TotalSavings ts ON u.UserID = ts.UserID
-                LEFT JOIN TotalExpenses te ON u.UserID = te.UserID
-                ORDER BY NetWorth DESC;
-                """
-                cur.execute(query)
+                cur.execute(queries.leaderboard_query(total_column), (limit, offset))
                 return cur.fetchall()
-            
+
+    # Leaderboard rows are (Rank, UserID, FirstName, LastName, Total); limit=None returns every row
+    @cached()
+    def get_savings_leaderboard_data(self, limit=None, offset=0):
+        return self._get_leaderboard("SavingsTotal", limit, offset)
+
+    @cached()
+    def get_expense_leaderboard_data(self, limit=None, offset=0):
+        return self._get_leaderboard("ExpensesTotal", limit, offset)
+
+    @cached()
+    def get_net_worth_leaderboard_data(self, limit=None, offset=0):
+        return self._get_leaderboard("NetWorth", limit, offset)
+
+    @cached()
+    def get_user_rank(self, user_id, metric='net_worth'):
+        # Returns (rank, total users, percentile) for one user without fetching the leaderboard.
+        # The rank sums the score histogram above the user and counts only the user's own
+        # bucket, so it stays bounded however far down the user is.
+        column = RANK_METRIC_COLUMNS[metric]
+        with self.connect() as conn:
+            with conn.cursor() as cur:
+                cur.execute(queries.user_rank_query(column), (column, user_id))
+                result = cur.fetchone()
+                if result is None:
+                    return None
+                rank, total_users = result
+                return rank, total_users, queries.rank_percentile(rank, total_users)
+
+    @cached()
     def get_total_number_of_users(self):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT COUNT(*) FROM Users;")
+                cur.execute(queries.TOTAL_NUMBER_OF_USERS)
                 result = cur.fetchone()
                 return result[0] if result else 0
         
+    @invalidates(("get_total_number_of_users", None), *LEADERBOARD_READS)
     def create_user(self, first_name, last_name, email, password):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    "INSERT INTO Users (FirstName, LastName, Email, Password, DateJoined) "
-                    "VALUES (%s, %s, %s, %s, CURRENT_DATE) RETURNING UserID;",
-                    (first_name.capitalize(), last_name.capitalize(), email, password)
-                )
+                cur.execute(queries.CREATE_USER, (first_name.capitalize(), last_name.capitalize(), email, password))
                 user_id = cur.fetchone()[0]
                 conn.commit()
                 return user_id
             
+    @invalidates(*TRANSACTION_WRITE_INVALIDATIONS)
     def add_new_saving(self, user_id, amount, purpose):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    "INSERT INTO Savings (UserID, Amount, Purpose, Date) VALUES (%s, %s, %s, CURRENT_DATE) RETURNING SavingsID;",
-                    (user_id, amount, purpose)
-                )
+                cur.execute(queries.ADD_NEW_SAVING, (user_id, amount, purpose))
                 savings_id = cur.fetchone()[0]
                 conn.commit()
                 return savings_id
 
+    @invalidates(*TRANSACTION_WRITE_INVALIDATIONS)
     def delete_saving(self, user_id, savings_id):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    "DELETE FROM Savings WHERE UserID = %s AND SavingsID = %s;",
-                    (user_id, savings_id)
-                )
+                cur.execute(queries.DELETE_SAVING, (user_id, savings_id))
                 conn.commit()
                 return cur.rowcount > 0  # Returns True if a row was deleted
 
+    @invalidates(*TRANSACTION_WRITE_INVALIDATIONS)
     def edit_saving(self, user_id, savings_id, new_amount, new_purpose):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    "UPDATE Savings SET Amount = %s, Purpose = %s WHERE UserID = %s AND SavingsID = %s;",
-                    (new_amount, new_purpose, user_id, savings_id)
-                )
+                cur.execute(queries.EDIT_SAVING, (new_amount, new_purpose, user_id, savings_id))
                 conn.commit()
                 return cur.rowcount > 0  # Returns True if a row was updated
+    @invalidates(*TRANSACTION_WRITE_INVALIDATIONS)
     def add_new_expense(self, user_id, amount, category):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    "INSERT INTO Expenses (UserID, Amount, Category, Date) VALUES (%s, %s, %s, CURRENT_DATE)",
-                    (user_id, amount, category)
-                )
+                cur.execute(queries.ADD_NEW_EXPENSE, (user_id, amount, category))
                 conn.commit()
 
+    @invalidates(*TRANSACTION_WRITE_INVALIDATIONS)
     def delete_expense(self, user_id, expense_id):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    "DELETE FROM Expenses WHERE UserID = %s AND ExpenseID = %s",
-                    (user_id, expense_id)
-                )
+                cur.execute(queries.DELETE_EXPENSE, (user_id, expense_id))
                 conn.commit()
 
+    @invalidates(*TRANSACTION_WRITE_INVALIDATIONS)
     def edit_expense(self, user_id, expense_id, new_amount, new_category):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    "UPDATE Expenses SET Amount = %s, Category = %s WHERE UserID = %s AND ExpenseID = %s",
-                    (new_amount, new_category, user_id, expense_id)
-                )
+                cur.execute(queries.EDIT_EXPENSE, (new_amount, new_category, user_id, expense_id))
                 conn.commit()
             
     def get_user_savings(self, user_id, sort_by='date', order='asc'):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                order_by = 'DESC' if order == 'desc' else 'ASC'
-                if sort_by == 'amount':
-                    query = "SELECT * FROM Savings WHERE UserID = %s ORDER BY Amount " + order_by
-                elif sort_by == 'date':
-                    query = "SELECT * FROM Savings WHERE UserID = %s ORDER BY Date " + order_by
-                # Add more sorting options as needed
-
-                cur.execute(query, (user_id,))
+                cur.execute(queries.sorted_entries_query("Savings", sort_by, order), (user_id,))
                 return cur.fetchall()
     def get_user_expenses(self, user_id, sort_by='date', order='asc'):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                order_by = 'DESC' if order == 'desc' else 'ASC'
-                if sort_by == 'amount':
-                    query = "SELECT * FROM Expenses WHERE UserID = %s ORDER BY Amount " + order_by
-                elif sort_by == 'date':
-                    query = "SELECT * FROM Expenses WHERE UserID = %s ORDER BY Date " + order_by
-                # Add more sorting options as needed
-
-                cur.execute(query, (user_id,))
+                cur.execute(queries.sorted_entries_query("Expenses", sort_by, order), (user_id,))
                 return cur.fetchall()
     
-    def get_total_savings(self, user_id):
+    def get_user_transactions(self, user_id, sort_by='date', order='asc', filter_type='both', limit=None, offset=0):
+        # Savings and expenses as one feed of (Type, ID, Amount, Purpose/Category, Date) rows,
+        # merged, sorted and paginated by the database.
+        feed = queries.transactions_query(user_id, sort_by, order, filter_type, limit, offset)
+        if feed is None:
+            return []
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT SUM(Amount) FROM Savings WHERE UserID = %s", (user_id,))
-                return cur.fetchone()[0] or 0
+                cur.execute(*feed)
+                return cur.fetchall()
 
-    def get_total_expenses(self, user_id):
+    def _get_user_total(self, column, user_id, default=0):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT SUM(Amount) FROM Expenses WHERE UserID = %s", (user_id,))
-                return cur.fetchone()[0] or 0
+                cur.execute(queries.user_total_query(column), (user_id,))
+                result = cur.fetchone()
+                return result[0] if result else default
+
+    def get_total_savings(self, user_id):
+        return self._get_user_total("SavingsTotal", user_id)
+
+    def get_total_expenses(self, user_id):
+        return self._get_user_total("ExpensesTotal", user_id)
     def get_highest_and_lowest_savings(self, user_id):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT MAX(Amount), MIN(Amount) FROM Savings WHERE UserID = %s", (user_id,))
-                return cur.fetchone()  # Returns (highest amount, lowest amount)
+                cur.execute(queries.HIGHEST_AND_LOWEST_SAVINGS, (user_id,))
+                return cur.fetchone() or (None, None)  # Returns (highest amount, lowest amount)
 
     def get_highest_and_lowest_expenses(self, user_id):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT MAX(Amount), MIN(Amount) FROM Expenses WHERE UserID = %s", (user_id,))
-                return cur.fetchone()  # Returns (highest amount, lowest amount)
+                cur.execute(queries.HIGHEST_AND_LOWEST_EXPENSES, (user_id,))
+                return cur.fetchone() or (None, None)  # Returns (highest amount, lowest amount)
 
     def get_number_of_savings_entries(self, user_id):
-        with self.connect() as conn:
-            with conn.cursor() as cur:
-                cur.execute("SELECT COUNT(*) FROM Savings WHERE UserID = %s", (user_id,))
-                return cur.fetchone()[0]  # Returns the number of savings entries
+        return self._get_user_total("SavingsCount", user_id)  # Returns the number of savings entries
 
     def get_number_of_expenses_entries(self, user_id):
+        return self._get_user_total("ExpensesCount", user_id)  # Returns the number of expenses entries
+
+    @cached()
+    def get_user_stats_snapshot(self, user_id):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT COUNT(*) FROM Expenses WHERE UserID = %s", (user_id,))
-                return cur.fetchone()[0]  # Returns the number of expenses entries
+                cur.execute(queries.USER_STATS_SNAPSHOT, (user_id,))
+                return queries.user_stats_snapshot(cur.fetchone())
 
     def get_savings_expenses_over_time(self, user_id):
+        return self.get_savings_expenses_series(user_id)
+
+    @cached()
+    def get_savings_expenses_span(self, user_id):
+        # (first date, last date) across the user's savings and expenses, (None, None) if there are none
+        with self.connect() as conn:
+            with conn.cursor() as cur:
+                cur.execute(queries.SAVINGS_EXPENSES_SPAN, {"user_id": user_id})
+                return cur.fetchone()
+
+    @cached()
+    def get_savings_expenses_downsampled(self, user_id, max_points, start=None, end=None):
+        # The series between start and end (default: the whole history) in buckets wide
+        # enough that at most max_points come back, however long the history is
+        window = queries.downsample_range(self.get_savings_expenses_span(user_id), max_points, start, end)
+        if window is None:
+            return []
+        bucket, start, end = window
+        return self.get_savings_expenses_series(user_id, bucket, start=start, end=end)
+
+    @cached()
+    def get_savings_expenses_series(self, user_id, bucket='day', cumulative=False, start=None, end=None):
+        # [(bucket_date, savings, expenses), ...]; see queries.series_query
+        query, params = queries.series_query(user_id, bucket, cumulative, start, end)
         with self.connect() as conn:
             with conn.cursor() as cur:
-                query = """
-                SELECT s.Date, COALESCE(SUM(s.Amount), 0) AS TotalSavings, COALESCE(SUM(e.Amount), 0) AS TotalExpenses
-                FROM Savings s
-                FULL OUTER JOIN Expenses e ON s.Date = e.Date AND s.UserID = e.UserID
-                WHERE s.UserID = %s OR e.UserID = %s
-                GROUP BY s.Date
-                ORDER BY s.Date
-                """
-                cur.execute(query, (user_id, user_id))
+                cur.execute(query, params)
                 return cur.fetchall()
 
     def get_user_net_savings(self, user_id):
         with self.connect() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT TotalSavings, TotalExpenses FROM Users WHERE UserID = %s;", (user_id,))
+                cur.execute(queries.USER_NET_SAVINGS, (user_id,))
                 result = cur.fetchone()
                 if result:
                     total_savings, total_expenses = result
@@ -389,65 +966,574 @@ class Database:
                 else:
                     return 0  # Or handle the user not found case appropriately
 
+    @cached()
     def get_total_net_worth_for_user(self, user_id):
-        with self.connect() as conn:
-            with conn.cursor() as cur:
-                cur.execute("SELECT NetWorth FROM TotalNetWorth WHERE UserID = %s", (user_id,))
-                result = cur.fetchone()
-                return result[0] if result else 0
+        return self._get_user_total("NetWorth", user_id)
+
+
+_query_thread_pool = None
+
+def get_query_thread_pool():
+    # Worker threads are shared by every window's QueryExecutor and created on first use
+    global _query_thread_pool
+    if _query_thread_pool is None:
+        _query_thread_pool = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix="query")
+    return _query_thread_pool
+
+
+class QueryExecutor:
+    # Runs database calls off the Tk thread. Finished calls are put on a completion queue
+    # that is drained from widget.after, so on_done/on_error always run on the Tk thread.
+    # Work still pending when the widget is destroyed (or after cancel_all) is dropped.
+    # Reads submitted with cancellable=True can also be dropped on their own with
+    # cancel_reads; writes always run and deliver their callbacks.
+    def __init__(self, widget, poll_interval=25):
+        self.widget = widget
+        self.poll_interval = poll_interval
+        self._completed = queue.Queue()
+        self._pending = set()
+        self._cancellable = set()
+        self._poll_id = None
+        self._closed = False
+        widget.bind('<Destroy>', self._on_destroy, add='+')
+
+    def submit(self, func, *args, on_done=None, on_error=None, cancellable=False):
+        if self._closed:
+            return None
+        future = get_query_thread_pool().submit(func, *args)
+        self._pending.add(future)
+        if cancellable:
+            self._cancellable.add(future)
+        future.add_done_callback(lambda done: self._completed.put((done, on_done, on_error)))
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(self.poll_interval, self._poll)
+        return future
+
+    def cancel_all(self):
+        # Queued calls never start; calls already running finish but their results are ignored
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._cancellable.clear()
+
+    def cancel_reads(self):
+        # Like cancel_all, but only for calls submitted with cancellable=True
+        for future in self._cancellable & self._pending:
+            future.cancel()
+            self._pending.discard(future)
+        self._cancellable.clear()
+
+    def close(self):
+        self._closed = True
+        self.cancel_all()
+        if self._poll_id is not None:
+            try:
+                self.widget.after_cancel(self._poll_id)
+            except tk.TclError:
+                pass
+            self._poll_id = None
+
+    def _on_destroy(self, event):
+        if event.widget is self.widget:
+            self.close()
+
+    def _poll(self):
+        self._poll_id = None
+        while not self._closed:
+            try:
+                future, on_done, on_error = self._completed.get_nowait()
+            except queue.Empty:
+                break
+            if future not in self._pending:
+                continue  # cancelled
+            self._pending.discard(future)
+            self._cancellable.discard(future)
+            error = future.exception()
+            try:
+                if error is None:
+                    if on_done:
+                        on_done(future.result())
+                elif on_error:
+                    on_error(error)
+                else:
+                    messagebox.showerror("Error", f"An error occurred: {error}")
+            except Exception:
+                # A broken callback must not stop delivery of the ones queued behind it
+                logger.exception("Query callback failed")
+        if self._pending and not self._closed:
+            self._poll_id = self.widget.after(self.poll_interval, self._poll)
+
+
+class VirtualTreeview:
+    # A ttk.Treeview that only materializes the rows around the visible area. Rows come
+    # from fetch_page(offset, limit); a page is fetched whenever fewer than buffer_rows
+    # loaded rows remain below (or above) the visible area. Once more than max_rows are
+    # loaded, whole pages at the far end are dropped and only their fetch position is
+    # kept, so scrolling back refetches them; a long list never holds more than about
+    # max_rows items. With an executor, pages are fetched off the Tk thread behind a
+    # "Loading..." row. Treeview methods such as heading, column, bind, selection and
+    # item are forwarded to the inner tree.
+    # With keyset=True, fetch_page receives the row before the page (None for the first
+    # page) instead of an offset.
+    def __init__(self, master, columns, fetch_page, page_size=100, buffer_rows=50, max_rows=1000, row_tags=None, executor=None, on_error=None, keyset=False, **tree_options):
+        self.frame = ttk.Frame(master)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show='headings', **tree_options)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.buffer_rows = buffer_rows
+        self.max_rows = max(max_rows, 3 * page_size)
+        self.row_tags = row_tags  # optional function mapping a row to its Treeview tags
+        self.executor = executor
+        self.on_error = on_error
+        self.keyset = keyset
+        self.limit = None
+        self.pages = deque()  # [position, item ids] of each materialized page, top to bottom
+        self.pages_above = []  # positions of dropped pages above the first one, nearest last
+        self.pages_below = []  # positions of dropped pages below the last one, nearest last
+        self.next_position = None  # where the first never-fetched page starts
+        self.loaded_rows = 0  # rows currently materialized
+        self.fetched_rows = 0  # distinct rows fetched so far, checked against limit
+        self.exhausted = True  # no rows left past next_position
+        self.failed = False
+        self.page_pending = False
+        self.generation = 0  # bumped on reload so pages requested before it are discarded
+        self.loading_item = None
+
+    def __getattr__(self, name):
+        if name == 'tree':
+            raise AttributeError(name)
+        return getattr(self.tree, name)
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def reload(self, limit=None):
+        # Drop every materialized row and start again from the first page; limit caps the total rows shown
+        self.tree.delete(*self.tree.get_children())
+        self.tree.yview_moveto(0)
+        self.generation += 1
+        self.loading_item = None
+        self.limit = limit
+        self.pages.clear()
+        self.pages_above = []
+        self.pages_below = []
+        self.next_position = None if self.keyset else 0
+        self.loaded_rows = 0
+        self.fetched_rows = 0
+        self.exhausted = False
+        self.failed = False
+        self.page_pending = False
+        self.load_next_page()
+
+    def delete_row(self, item):
+        # Drop one materialized row whose source row no longer matches fetch_page, e.g. after a
+        # join. Offsets after it shift back by one along with the server's result set.
+        for index, (position, items) in enumerate(self.pages):
+            if item in items:
+                items.remove(item)
+                break
+        else:
+            return
+        self.tree.delete(item)
+        self.loaded_rows -= 1
+        self.fetched_rows -= 1
+        if not self.keyset:
+            for page in list(self.pages)[index + 1:]:
+                page[0] -= 1
+            self.pages_below = [position - 1 for position in self.pages_below]
+            self.next_position -= 1
+
+    def load_next_page(self):
+        self.load_page(below=True)
+
+    def load_previous_page(self):
+        self.load_page(below=False)
+
+    def load_page(self, below):
+        if self.failed or self.loading_item is not None:
+            self.page_pending = False
+            return
+        page_size = self.page_size
+        if not below:
+            if not self.pages_above:
+                self.page_pending = False
+                return
+            position, fresh = self.pages_above[-1], False
+        elif self.pages_below:
+            position, fresh = self.pages_below[-1], False
+        elif not self.exhausted:
+            position, fresh = self.next_position, True
+            if self.limit is not None:
+                page_size = min(page_size, self.limit - self.fetched_rows)
+        else:
+            self.page_pending = False
+            return
 
+        if self.executor is None:
+            self.page_pending = False
+            self.add_page(self.generation, below, position, fresh, page_size, self.fetch_page(position, page_size))
+            return
+
+        generation = self.generation
+        self.page_pending = True
+        self.loading_item = self.tree.insert('', tk.END if below else 0, values=("Loading...",))
+        self.executor.submit(self.fetch_page, position, page_size,
+                             on_done=lambda rows: self.add_page(generation, below, position, fresh, page_size, rows),
+                             on_error=lambda error: self.page_failed(generation, error), cancellable=True)
+
+    def add_page(self, generation, below, position, fresh, page_size, rows):
+        if generation != self.generation:
+            return
+        self.remove_loading_item()
+        self.page_pending = False
+        top = round(float(self.tree.yview()[0]) * self.loaded_rows)
+
+        if fresh:
+            self.fetched_rows += len(rows)
+            self.exhausted = len(rows) < page_size or self.fetched_rows == self.limit
+            if rows:
+                self.next_position = rows[-1] if self.keyset else position + len(rows)
+        elif below:
+            self.pages_below.pop()
+        else:
+            self.pages_above.pop()
+        if not rows:
+            return
+
+        items = []
+        for index, row in enumerate(rows):
+            tags = self.row_tags(row) if self.row_tags else ()
+            items.append(self.tree.insert('', tk.END if below else index, values=row, tags=tags))
+        self.loaded_rows += len(items)
+        if below:
+            self.pages.append([position, items])
+        else:
+            self.pages.appendleft([position, items])
+            top += len(items)
+
+        # Drop whole pages from the far end; the visible rows keep their place on screen
+        while self.loaded_rows > self.max_rows and len(self.pages) > 1:
+            dropped_position, dropped = self.pages.popleft() if below else self.pages.pop()
+            (self.pages_above if below else self.pages_below).append(dropped_position)
+            self.tree.delete(*dropped)
+            self.loaded_rows -= len(dropped)
+            if below:
+                top -= len(dropped)
+        if self.loaded_rows:
+            self.tree.yview_moveto(max(0, top) / self.loaded_rows)
+
+    def page_failed(self, generation, error):
+        if generation != self.generation:
+            return
+        self.remove_loading_item()
+        self.page_pending = False
+        self.failed = True  # stop retrying on every scroll; reload() starts over
+        if self.on_error:
+            self.on_error(error)
+        else:
+            messagebox.showerror("Error", f"An error occurred while loading data: {error}")
+
+    def remove_loading_item(self):
+        if self.loading_item is not None:
+            self.tree.delete(self.loading_item)
+            self.loading_item = None
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self.failed or self.page_pending:
+            return
+        if (self.pages_below or not self.exhausted) and self.loaded_rows * (1.0 - float(last)) < self.buffer_rows:
+            self.page_pending = True
+            self.tree.after_idle(self.load_next_page)
+        elif self.pages_above and self.loaded_rows * float(first) < self.buffer_rows:
+            self.page_pending = True
+            self.tree.after_idle(self.load_previous_page)
+
+
+class DebouncedEntry:
+    # A labelled Entry that reports its stripped text to on_change once typing pauses for
+    # delay_ms, so a filter runs one query per pause rather than one per keystroke.
+    def __init__(self, master, label, on_change, delay_ms=FILTER_DEBOUNCE_MS):
+        self.frame = ttk.Frame(master)
+        ttk.Label(self.frame, text=label).pack(side="left")
+        self.variable = tk.StringVar(self.frame)
+        self.entry = ttk.Entry(self.frame, textvariable=self.variable, width=40)
+        self.entry.pack(side="left", padx=5)
+        self.on_change = on_change
+        self.delay_ms = delay_ms
+        self.job = None
+        self.variable.trace_add("write", self.on_write)
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def on_write(self, *_):
+        if self.job is not None:
+            self.frame.after_cancel(self.job)
+        self.job = self.frame.after(self.delay_ms, self.fire)
+
+    def fire(self):
+        self.job = None
+        self.on_change(self.variable.get().strip())
+
+
+class TrendChart:
+    # Savings and expenses line chart embedded in a Tk container. The Figure is built once,
+    # outside pyplot's global figure manager, and reused for every update: new data is
+    # swapped into the existing lines and, when the axes limits stay put, only the lines
+    # are blitted over a cached background. on_zoom(start, end) is called with the
+    # visible date range after the user zooms or pans. Everything is released when the
+    # canvas widget is destroyed.
+    def __init__(self, master, on_zoom=None):
+        # Imported here so only opening the stats view pays for matplotlib
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        from matplotlib.figure import Figure
+        import matplotlib.dates as mdates
+
+        self.mdates = mdates
+        self.figure = Figure(figsize=(8, 4), dpi=100)
+        self.ax = self.figure.add_subplot()
+        self.savings_line, = self.ax.plot([], [], label='Savings', color='green', animated=True)
+        self.expenses_line, = self.ax.plot([], [], label='Expenses', color='red', animated=True)
+
+        # Let matplotlib pick a tick spacing that stays readable at any range
+        locator = mdates.AutoDateLocator()
+        self.ax.xaxis.set_major_locator(locator)
+        self.ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+        self.ax.set_xlabel('Date')
+        self.ax.set_ylabel('Amount per period')
+        self.ax.set_title('Savings and Expenses Over Time')
+        self.ax.legend()
+        self.figure.tight_layout()
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        self.toolbar = NavigationToolbar2Tk(self.canvas, master, pack_toolbar=False)
+        self.toolbar.update()
+        self.widget = self.canvas.get_tk_widget()
+
+        self.on_zoom = on_zoom
+        self.background = None
+        self.updating = False
+        self.has_data = False
+        self.draw_connection = self.canvas.mpl_connect('draw_event', self.on_draw)
+        self.zoom_connection = self.ax.callbacks.connect('xlim_changed', self.on_xlim_changed)
+        self.widget.bind('<Destroy>', self.release, add='+')
+
+    def pack(self, **pack_options):
+        self.toolbar.pack(side='bottom', fill='x')
+        self.widget.pack(**pack_options)
+
+    def width(self):
+        return self.widget.winfo_width()
+
+    def set_data(self, data, rescale_x=True):
+        # data is [(date, savings, expenses), ...]
+        if self.figure is None:
+            return
+        self.savings_line.set_data([record[0] for record in data], [record[1] for record in data])
+        self.expenses_line.set_data([record[0] for record in data], [record[2] for record in data])
 
-class LoginWindow:
+        # Limit changes made here are the chart's own, not the user zooming
+        self.updating = True
+        try:
+            limits = (self.ax.get_xlim(), self.ax.get_ylim())
+            self.ax.relim()
+            self.ax.autoscale_view(scalex=rescale_x)
+        finally:
+            self.updating = False
+        self.has_data = True
+
+        if self.background is None or limits != (self.ax.get_xlim(), self.ax.get_ylim()):
+            # Axes changed, so the cached background is stale; on_draw re-blits the lines
+            self.canvas.draw_idle()
+        else:
+            self.canvas.restore_region(self.background)
+            self.draw_lines()
+            self.canvas.blit(self.figure.bbox)
+
+    def draw_lines(self):
+        self.ax.draw_artist(self.savings_line)
+        self.ax.draw_artist(self.expenses_line)
+
+    def on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.draw_lines()
+
+    def on_xlim_changed(self, ax):
+        if self.has_data and not self.updating and self.on_zoom is not None:
+            start, end = (self.mdates.num2date(limit).date() for limit in ax.get_xlim())
+            self.on_zoom(start, end)
+
+    def release(self, event=None):
+        if event is not None and event.widget is not self.widget:
+            return
+        if self.figure is None:
+            return
+        self.canvas.mpl_disconnect(self.draw_connection)
+        self.ax.callbacks.disconnect(self.zoom_connection)
+        self.figure.clear()
+        self.background = None
+        self.on_zoom = None
+        self.figure = self.ax = self.canvas = self.toolbar = None
+
+
+class App:
+    # The application's single Tk root and screen router. Each screen class is built
+    # once into a frame and cached; show() swaps frames, title and menubar and asks a
+    # cached screen to refresh its data with on_show(). Everything runs in one
+    # mainloop, so navigation never re-initializes Tcl or nests event loops. Logging
+    # out destroys the cached screens so the next user starts fresh.
     def __init__(self, database):
         self.database = database
         self.root = tk.Tk()
-        self.root.title("Welcome to SaveSphere")
-        self.root.geometry("600x600")
+        self.executor = QueryExecutor(self.root)
+        self.screens = {}
+        self.current = None
+        self.user_id = None
+        self.compaction_job = None
+
+    def show(self, screen_class):
+        screen = self.screens.get(screen_class)
+        if screen is None:
+            screen = screen_class(self, self.database, self.user_id)
+            self.screens[screen_class] = screen
+        else:
+            screen.on_show()
+
+        if self.current is not None and self.current is not screen:
+            # Reads for a hidden screen are stale by the time it returns and on_show reloads them;
+        # writes still finish and report back
+            self.current.executor.cancel_reads()
+            self.current.window.pack_forget()
+        self.root.title(screen.title)
+        self.root.geometry(screen.geometry)
+        self.root.config(menu=screen.menubar)
+        screen.window.pack(fill='both', expand=True)
+        self.current = screen
+
+    def login(self, user_id):
+        self.user_id = user_id
+        if self.compaction_job is None:
+            self.compact_contributions()  # migrations have been applied by the time anyone logs in
+        self.show(DashboardWindow)
+
+    def compact_contributions(self):
+        # Keeps the pending tail of the contributions ledger short; concurrent clients
+        # skip the round while another one is compacting
+        self.executor.submit(self.database.compact_group_contributions,
+                             on_error=lambda error: logger.warning("Contribution compaction failed: %s", error))
+        self.compaction_job = self.root.after(CONTRIBUTION_COMPACTION_MS, self.compact_contributions)
+
+    def logout(self):
+        self.user_id = None
+        self.show(LoginWindow)
+        for screen_class, screen in list(self.screens.items()):
+            if screen_class is not LoginWindow:
+                screen.destroy()
+                del self.screens[screen_class]
+
+    def run(self):
+        self.root.mainloop()
+
+
+class Screen:
+    # One cached page of the App: widgets go in self.window (a frame of the root),
+    # menu entries in self.menubar
+    title = "SaveSphere"
+    geometry = "1200x1200"
+
+    def __init__(self, app, database, user_id=None):
+        self.app = app
+        self.database = database
+        self.user_id = user_id
+        self.window = tk.Frame(app.root)
+        self.menubar = Menu(app.root, tearoff=0)
+        self.executor = QueryExecutor(self.window)
+
+    def on_show(self):
+        # Called when a cached screen is shown again; reload whatever may have changed
+        pass
 
+    def destroy(self):
+        self.window.destroy()
+        self.menubar.destroy()
+
+
+class LoginWindow(Screen):
+    title = "Welcome to SaveSphere"
+    geometry = "600x600"
+
+    def __init__(self, app, database, user_id=None):
+        super().__init__(app, database, user_id)
         self.create_widgets()
 
     def create_widgets(self):
-        header_label = tk.Label(self.root, text="Welcome to SaveSphere", font=("Arial", 20))
+        header_label = tk.Label(self.window, text="Welcome to SaveSphere", font=("Arial", 20))
         header_label.pack(pady=(20, 10))
 
-        email_login_label = tk.Label(self.root, text="Email", font=("Arial", 14))
+        email_login_label = tk.Label(self.window, text="Email", font=("Arial", 14))
         email_login_label.pack()
-        self.email_login_entry = tk.Entry(self.root, font=("Arial", 14))
+        self.email_login_entry = tk.Entry(self.window, font=("Arial", 14))
         self.email_login_entry.pack(pady=(0, 10))
 
-        password_login_label = tk.Label(self.root, text="Password", font=("Arial", 14))
+        password_login_label = tk.Label(self.window, text="Password", font=("Arial", 14))
         password_login_label.pack()
-        self.password_login_entry = tk.Entry(self.root, font=("Arial", 14), show="*")
+        self.password_login_entry = tk.Entry(self.window, font=("Arial", 14), show="*")
         self.password_login_entry.pack(pady=(0, 20))
 
-        login_button = tk.Button(self.root, text="Login", font=("Arial", 14), bg="#FFA07A", command=self.on_login_click)
-        login_button.pack(pady=(0, 20))
+        self.login_button = tk.Button(self.window, text="Login", font=("Arial", 14), bg="#FFA07A", command=self.on_login_click)
+        self.login_button.pack(pady=(0, 20))
+
+        self.create_user_button = tk.Button(self.window, text="No login? Create user", font=("Arial", 14), bg="#FFA07A", command=self.on_create_user_click)
+        self.create_user_button.pack(side=tk.RIGHT, padx=(20, 50), pady=(0, 20))
+
+        if not self.database.migrations_applied:
+            # The window paints first; the first connection (and the psycopg2 import)
+            # and the migrations happen on a worker thread while the user types.
+            self.login_button.config(state=tk.DISABLED, text="Connecting...")
+            self.create_user_button.config(state=tk.DISABLED)
+            self.window.after_idle(self.prepare_database)
+
+    def prepare_database(self):
+        self.executor.submit(self.database.apply_migrations, on_done=self.on_database_ready, on_error=self.on_database_error)
+
+    def on_database_ready(self, applied=None):
+        self.login_button.config(state=tk.NORMAL, text="Login")
+        self.create_user_button.config(state=tk.NORMAL)
+
+    def on_database_error(self, error):
+        messagebox.showerror("Error", f"Could not prepare the database: {error}")
+        self.on_database_ready()
 
-        create_user_button = tk.Button(self.root, text="No login? Create user", font=("Arial", 14), bg="#FFA07A", command=self.on_create_user_click)
-        create_user_button.pack(side=tk.RIGHT, padx=(20, 50), pady=(0, 20))
+    def on_show(self):
+        self.password_login_entry.delete(0, tk.END)
 
     def on_login_click(self):
         user_email = self.email_login_entry.get()
         user_password = self.password_login_entry.get()
-        user_id = self.database.login_user(user_email, user_password)
+        self.executor.submit(self.database.login_user, user_email, user_password, on_done=self.on_login_result)
+
+    def on_login_result(self, user_id):
         if user_id:
-            self.root.destroy()  # Close the login window
-            DashboardWindow(self.database, user_id)  # Open the dashboard window
+            self.app.login(user_id)
         else:
             messagebox.showerror("Login Failed", "Invalid email or password.")
 
     def on_create_user_click(self):
         CreateUserWindow(self.database)
 
-    def run(self):
-        self.root.mainloop()
-
 class CreateUserWindow:
     def __init__(self, database):
         self.database = database
         self.create_user_window = Toplevel()
         self.create_user_window.title("Create New User")
         self.create_user_window.geometry("400x300")
+        self.executor = QueryExecutor(self.create_user_window)
 
         self.create_widgets()
 
@@ -476,27 +1562,26 @@ class CreateUserWindow:
         last_name = self.last_name_entry.get()
         email = self.email_entry.get()
         password = self.password_entry.get()
-        user_id = self.database.create_user(first_name, last_name, email, password)
+        self.executor.submit(self.database.create_user, first_name, last_name, email, password, on_done=self.on_user_created)
+
+    def on_user_created(self, user_id):
         if user_id:
             messagebox.showinfo("Success", "User created successfully. Your user ID is: " + str(user_id))
             self.create_user_window.destroy()  # Close the create user window
         else:
             messagebox.showerror("Registration Failed", "Unable to create user.")
 
-class SavingsWindow:
-    def __init__(self, database, user_id):
-        self.database = database
-        self.user_id = user_id
-        self.window = tk.Tk()
-        self.window.title("Savings")
-        self.window.geometry("1200x1200")  # Adjust the size as needed
+class SavingsWindow(Screen):
+    title = "Savings"
+    geometry = "1200x1200"
+
+    def __init__(self, app, database, user_id=None):
+        super().__init__(app, database, user_id)
         self.create_widgets()
-        self.window.mainloop()
 
     def create_widgets(self):
         # Menu bar setup
-        menubar = Menu(self.window)
-        self.window.config(menu=menubar)
+        menubar = self.menubar
 
         # Savings options menu
         savings_menu = Menu(menubar, tearoff=0)
@@ -542,8 +1627,11 @@ class SavingsWindow:
         refresh_button = tk.Button(options_frame, text="Refresh", command=lambda: self.refresh_data(sort_by_var.get(), sort_order_var.get(), filter_var.get()))
         refresh_button.grid(row=0, column=4, padx=5)
 
-        # Treeview for displaying savings
-        self.savings_tree = ttk.Treeview(self.window, columns=("Type", "ID", "Amount", "Purpose/Category", "Date"), show='headings')
+        # Treeview for displaying savings; the merged feed is sorted by the database and paged in on scroll
+        self.feed_options = ("date", "asc", 'both')
+        self.savings_tree = VirtualTreeview(self.window, ("Type", "ID", "Amount", "Purpose/Category", "Date"),
+                                            self.fetch_transactions, page_size=TRANSACTIONS_PAGE_SIZE,
+                                            row_tags=lambda item: (item[0].lower(),), executor=self.executor)
         self.savings_tree.column("Type", width=60)  # New column for type
         self.savings_tree.column("ID", width=50)    # Adjust the width as needed
         self.savings_tree.column("Amount", width=100)  # Adjust the width as needed
@@ -558,42 +1646,31 @@ class SavingsWindow:
 
         self.savings_tree.pack(side="left", fill="both", expand=True, padx=10, pady=10)
 
+        self.savings_tree.tag_configure('saving', background='lightgreen')
+        self.savings_tree.tag_configure('expense', background='lightcoral')
+
         # Initial loading of savings
         self.refresh_data("date", "asc", 'both')
 
     def refresh_data(self, sort_by, order, filter_type):
-        for i in self.savings_tree.get_children():
-            self.savings_tree.delete(i)  # Clear the treeview
-
-        combined_data = []
+        self.feed_options = (sort_by, order, filter_type)
+        self.savings_tree.reload()
 
-        if filter_type in ['both', 'savings']:
-            savings = self.database.get_user_savings(self.user_id, sort_by, order)
-            for saving in savings:
-                # Assuming saving tuple is in the format: (SavingsID, UserID, Amount, Purpose, Date)
-                combined_data.append(('Saving', saving[0], saving[2], saving[3], saving[4]))
+    def on_show(self):
+        self.savings_tree.reload()
 
-        if filter_type in ['both', 'expenses']:
-            expenses = self.database.get_user_expenses(self.user_id, sort_by, order)
-            for expense in expenses:
-                # Assuming expense tuple is in the format: (ExpenseID, UserID, Amount, Category, Date)
-                combined_data.append(('Expense', expense[0], expense[2], expense[3], expense[4]))
+    def fetch_transactions(self, offset, limit):
+        sort_by, order, filter_type = self.feed_options
+        return self.database.get_user_transactions(self.user_id, sort_by, order, filter_type, limit, offset)
 
-        # Sort the combined data
-        sort_index = 4 if sort_by == 'date' else 2  # Adjust based on your sorting criteria
-        combined_data.sort(key=lambda x: x[sort_index], reverse=(order == 'desc'))
 
-        # Insert sorted data into the treeview
-        for item in combined_data:
-            self.savings_tree.insert('', tk.END, values=item, tags=(item[0].lower(),))
-
-        self.savings_tree.tag_configure('saving', background='lightgreen')
-        self.savings_tree.tag_configure('expense', background='lightcoral')
+    def back_to_dashboard(self):
+        self.app.show(DashboardWindow)
 
+    def finish_write(self, window, message):
+        window.destroy()
+        messagebox.showinfo("Success", message)
 
-    def back_to_dashboard(self):
-        self.window.destroy()  # Close the savings window
-        DashboardWindow(self.database, self.user_id)  # Open the dashboard window
     def add_new_expense(self):
         add_window = Toplevel(self.window)
         add_window.title("Add New Expense")
@@ -613,9 +1690,8 @@ class SavingsWindow:
 
     def submit_add_new_expense(self, amount, purpose, window):
         # Implement the logic to add a new saving to the database
-        self.database.add_new_expense(self.user_id, amount, purpose)
-        window.destroy()
-        messagebox.showinfo("Success", "New expense added successfully.")
+        self.executor.submit(self.database.add_new_expense, self.user_id, amount, purpose,
+                             on_done=lambda _: self.finish_write(window, "New expense added successfully."))
 
     def delete_expense(self):
         delete_window = Toplevel(self.window)
@@ -632,9 +1708,8 @@ class SavingsWindow:
 
     def submit_delete_expense(self, expense_id, window):
         # Implement the logic to delete a saving from the database
-        self.database.delete_expense(self.user_id, expense_id)
-        window.destroy()
-        messagebox.showinfo("Success", "Expense deleted successfully.")
+        self.executor.submit(self.database.delete_expense, self.user_id, expense_id,
+                             on_done=lambda _: self.finish_write(window, "Expense deleted successfully."))
     
 
     def edit_expense(self):
@@ -660,9 +1735,8 @@ class SavingsWindow:
 
     def submit_edit_expense(self, expense_id, new_amount, new_purpose, window):
         # Implement the logic to edit a saving in the database
-        self.database.edit_expense(self.user_id, expense_id, new_amount, new_purpose)
-        window.destroy()
-        messagebox.showinfo("Success", "Saving edited successfully.")
+        self.executor.submit(self.database.edit_expense, self.user_id, expense_id, new_amount, new_purpose,
+                             on_done=lambda _: self.finish_write(window, "Saving edited successfully."))
 
     def add_new_saving(self):
         add_window = Toplevel(self.window)
@@ -683,9 +1757,8 @@ class SavingsWindow:
 
     def submit_add_new_saving(self, amount, purpose, window):
         # Implement the logic to add a new saving to the database
-        self.database.add_new_saving(self.user_id, amount, purpose)
-        window.destroy()
-        messagebox.showinfo("Success", "New saving added successfully.")
+        self.executor.submit(self.database.add_new_saving, self.user_id, amount, purpose,
+                             on_done=lambda _: self.finish_write(window, "New saving added successfully."))
 
     def delete_saving(self):
         delete_window = Toplevel(self.window)
@@ -702,9 +1775,8 @@ class SavingsWindow:
 
     def submit_delete_saving(self, saving_id, window):
         # Implement the logic to delete a saving from the database
-        self.database.delete_saving(self.user_id, saving_id)
-        window.destroy()
-        messagebox.showinfo("Success", "Saving deleted successfully.")
+        self.executor.submit(self.database.delete_saving, self.user_id, saving_id,
+                             on_done=lambda _: self.finish_write(window, "Saving deleted successfully."))
 
     def edit_saving(self):
         edit_window = Toplevel(self.window)
@@ -729,28 +1801,36 @@ class SavingsWindow:
 
     def submit_edit_saving(self, saving_id, new_amount, new_purpose, window):
         # Implement the logic to edit a saving in the database
-        self.database.edit_saving(self.user_id, saving_id, new_amount, new_purpose)
-        window.destroy()
-        messagebox.showinfo("Success", "Saving edited successfully.")
+        self.executor.submit(self.database.edit_saving, self.user_id, saving_id, new_amount, new_purpose,
+                             on_done=lambda _: self.finish_write(window, "Saving edited successfully."))
     
     def open_savings_stats(self):
-        self.window.destroy()  # Close the savings window
-        SavingsStatsWindow(self.database, self.user_id)
-
-class SavingsStatsWindow:
-    def __init__(self, database, user_id):
-        self.database = database
-        self.user_id = user_id
-        self.window = tk.Tk()
-        self.window.title("Savings")
-        self.window.geometry("1200x1200")  # Adjust the size as needed
+        self.app.show(SavingsStatsWindow)
+
+class SavingsStatsWindow(Screen):
+    # (snapshot key, label caption) for each line of the stats panel
+    STATS_FIELDS = [
+        ('total_savings', "Total Savings: $"),
+        ('total_expenses', "Total Expenses: $"),
+        ('net_worth', "Net Worth: $"),
+        ('highest_savings', "Highest Savings: $"),
+        ('lowest_savings', "Lowest Savings: $"),
+        ('highest_expenses', "Highest Expenses: $"),
+        ('lowest_expenses', "Lowest Expenses: $"),
+        ('savings_entries', "Number of Savings Entries: "),
+        ('expenses_entries', "Number of Expenses Entries: "),
+    ]
+
+    title = "Savings"
+    geometry = "1200x1200"
+
+    def __init__(self, app, database, user_id=None):
+        super().__init__(app, database, user_id)
         self.create_widgets()
-        self.window.mainloop()
 
     def create_widgets(self):
         # Menu bar setup
-        menubar = Menu(self.window)
-        self.window.config(menu=menubar)
+        menubar = self.menubar
 
         # Savings options menu
         savings_menu = Menu(menubar, tearoff=0)
@@ -773,67 +1853,89 @@ class SavingsStatsWindow:
 
         tk.Label(self.window, text="Savings Stats", font=("Arial", 24)).pack(pady=20)
 
-        total_savings = self.database.get_total_savings(self.user_id)
-        total_expenses = self.database.get_total_expenses(self.user_id)
-        net_worth = total_savings - total_expenses
-        highest_lowest_savings = self.database.get_highest_and_lowest_savings(self.user_id)
-        highest_lowest_expenses = self.database.get_highest_and_lowest_expenses(self.user_id)
-        number_of_savings_entries = self.database.get_number_of_savings_entries(self.user_id)
-        number_of_expenses_entries = self.database.get_number_of_expenses_entries(self.user_id)
-
         stats_frame = tk.Frame(self.window)
         stats_frame.pack(pady=10)
 
-        tk.Label(stats_frame, text=f"Total Savings: ${total_savings}", font=("Arial", 14)).pack()
-        tk.Label(stats_frame, text=f"Total Expenses: ${total_expenses}", font=("Arial", 14)).pack()
-        tk.Label(stats_frame, text=f"Net Worth: ${net_worth}", font=("Arial", 14)).pack()
-        tk.Label(stats_frame, text=f"Highest Savings: ${highest_lowest_savings[0]}", font=("Arial", 14)).pack()
-        tk.Label(stats_frame, text=f"Lowest Savings: ${highest_lowest_savings[1]}", font=("Arial", 14)).pack()
-        tk.Label(stats_frame, text=f"Highest Expenses: ${highest_lowest_expenses[0]}", font=("Arial", 14)).pack()
-        tk.Label(stats_frame, text=f"Lowest Expenses: ${highest_lowest_expenses[1]}", font=("Arial", 14)).pack()
-        tk.Label(stats_frame, text=f"Number of Savings Entries: {number_of_savings_entries}", font=("Arial", 14)).pack()
-        tk.Label(stats_frame, text=f"Number of Expenses Entries: {number_of_expenses_entries}", font=("Arial", 14)).pack()
-
-        self.plot_savings_expenses_trends()
-
-    def plot_savings_expenses_trends(self):
-        data = self.database.get_savings_expenses_over_time(self.user_id)
-        # Assuming data is in the format [(date1, savings1, expenses1), (date2, savings2, expenses2), ...]
-
-        # If dates are already datetime.date objects, no conversion is needed
-        dates = [record[0] for record in data]
-        savings = [record[1] for record in data]
-        expenses = [record[2] for record in data]
-
-        fig, ax = plt.subplots()
-
-        # Plotting
-        ax.plot(dates, savings, label='Savings', color='green')
-        ax.plot(dates, expenses, label='Expenses', color='red')
-
-        # Formatting the date to make it more readable
-        ax.xaxis.set_major_locator(mdates.MonthLocator())
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%b %Y'))
-        plt.xticks(rotation=45)
-
-        # Adding labels and title
-        ax.set_xlabel('Date')
-        ax.set_ylabel('Amount')
-        ax.set_title('Savings and Expenses Over Time')
-        ax.legend()
-
-        # Adjust layout
-        plt.tight_layout()
-
-        # Embedding the plot into the Tkinter window
-        canvas = FigureCanvasTkAgg(fig, master=self.window)
-        canvas_widget = canvas.get_tk_widget()
-        canvas_widget.pack(expand=True, fill='both')
-        canvas.draw()
-       
+        # Labels show placeholders until the snapshot arrives from the worker thread
+        self.stats_labels = {}
+        for key, caption in self.STATS_FIELDS:
+            self.stats_labels[key] = tk.Label(stats_frame, text=f"{caption}...", font=("Arial", 14))
+            self.stats_labels[key].pack()
+
+        self.chart = TrendChart(self.window, on_zoom=self.on_chart_zoom)
+        self.chart.pack(expand=True, fill='both', pady=20)
+        self.chart_range = None  # (start, end) while zoomed in, None for the whole history
+        self.chart_generation = 0
+        self.zoom_job = None
+        self.resize_job = None
+        self.loaded_points = None
+        self.chart.widget.bind('<Configure>', self.on_chart_resize, add='+')
+
+        # Wait until App.show has packed the frame, so the first fetch is sized to the real chart width
+        self.window.after_idle(self.refresh_stats)
+
+    def on_show(self):
+        self.refresh_stats()
+
+    def refresh_stats(self):
+        # Called on open and after every write; the cache drops the user's stale entries on write
+        self.executor.submit(self.database.get_user_stats_snapshot, self.user_id, on_done=self.show_stats, cancellable=True)
+        self.load_chart_data(*(self.chart_range or (None, None)))
+
+    def chart_points(self):
+        # One bucket per few pixels of chart width is as much detail as can be seen
+        self.window.update_idletasks()
+        return max(CHART_MIN_POINTS, self.chart.width() // CHART_PIXELS_PER_POINT)
+
+    def load_chart_data(self, start=None, end=None):
+        # Only the newest request is drawn, so fast zooming never shows an older range
+        self.chart_generation += 1
+        generation = self.chart_generation
+        self.loaded_points = self.chart_points()
+        self.executor.submit(self.database.get_savings_expenses_downsampled, self.user_id, self.loaded_points, start, end,
+                             on_done=lambda data: self.plot_savings_expenses_trends(data, generation), cancellable=True)
+
+    def show_stats(self, stats):
+        for key, caption in self.STATS_FIELDS:
+            self.stats_labels[key].config(text=f"{caption}{stats[key]}")
+
+    def plot_savings_expenses_trends(self, data, generation=None):
+        # data is [(bucket_date, savings, expenses), ...], already bucketed to fit the canvas
+        if generation is not None and generation != self.chart_generation:
+            return
+        # While zoomed the x limits are the user's; only the y axis follows the data
+        self.chart.set_data(data, rescale_x=self.chart_range is None)
+
+    def on_chart_zoom(self, start, end):
+        # Debounced so a drag or scroll triggers one refetch once it settles
+        if self.zoom_job is not None:
+            self.window.after_cancel(self.zoom_job)
+        self.zoom_job = self.window.after(CHART_ZOOM_DEBOUNCE_MS, lambda: self.refetch_range(start, end))
+
+    def on_chart_resize(self, event):
+        # A wider or narrower canvas wants a different number of buckets; refetch once resizing settles
+        if self.loaded_points is None or max(CHART_MIN_POINTS, event.width // CHART_PIXELS_PER_POINT) == self.loaded_points:
+            return
+        if self.resize_job is not None:
+            self.window.after_cancel(self.resize_job)
+        self.resize_job = self.window.after(CHART_ZOOM_DEBOUNCE_MS, self.refetch_for_size)
+
+    def refetch_for_size(self):
+        self.resize_job = None
+        self.load_chart_data(*(self.chart_range or (None, None)))
+
+    def refetch_range(self, start, end):
+        self.zoom_job = None
+        self.chart_range = (start, end)
+        self.load_chart_data(start, end)
+
     def back_to_dashboard(self):
-        self.window.destroy()  # Close the savings window
-        DashboardWindow(self.database, self.user_id)  # Open the dashboard window
+        self.app.show(DashboardWindow)
+
+    def finish_write(self, window, message):
+        window.destroy()
+        self.refresh_stats()
+        messagebox.showinfo("Success", message)
 
     def add_new_saving(self):
         add_window = Toplevel(self.window)
@@ -854,9 +1956,8 @@ class SavingsStatsWindow:
 
     def submit_add_new_saving(self, amount, purpose, window):
         # Implement the logic to add a new saving to the database
-        self.database.add_new_saving(self.user_id, amount, purpose)
-        window.destroy()
-        messagebox.showinfo("Success", "New saving added successfully.")
+        self.executor.submit(self.database.add_new_saving, self.user_id, amount, purpose,
+                             on_done=lambda _: self.finish_write(window, "New saving added successfully."))
 
     def delete_saving(self):
         delete_window = Toplevel(self.window)
@@ -873,9 +1974,8 @@ class SavingsStatsWindow:
 
     def submit_delete_saving(self, saving_id, window):
         # Implement the logic to delete a saving from the database
-        self.database.delete_saving(self.user_id, saving_id)
-        window.destroy()
-        messagebox.showinfo("Success", "Saving deleted successfully.")
+        self.executor.submit(self.database.delete_saving, self.user_id, saving_id,
+                             on_done=lambda _: self.finish_write(window, "Saving deleted successfully."))
 
     def edit_saving(self):
         edit_window = Toplevel(self.window)
@@ -900,9 +2000,8 @@ class SavingsStatsWindow:
 
     def submit_edit_saving(self, saving_id, new_amount, new_purpose, window):
         # Implement the logic to edit a saving in the database
-        self.database.edit_saving(self.user_id, saving_id, new_amount, new_purpose)
-        window.destroy()
-        messagebox.showinfo("Success", "Saving edited successfully.")
+        self.executor.submit(self.database.edit_saving, self.user_id, saving_id, new_amount, new_purpose,
+                             on_done=lambda _: self.finish_write(window, "Saving edited successfully."))
     
     def add_new_expense(self):
         add_window = Toplevel(self.window)
@@ -923,9 +2022,8 @@ class SavingsStatsWindow:
 
     def submit_add_new_expense(self, amount, purpose, window):
         # Implement the logic to add a new saving to the database
-        self.database.add_new_expense(self.user_id, amount, purpose)
-        window.destroy()
-        messagebox.showinfo("Success", "New expense added successfully.")
+        self.executor.submit(self.database.add_new_expense, self.user_id, amount, purpose,
+                             on_done=lambda _: self.finish_write(window, "New expense added successfully."))
 
     def delete_expense(self):
         delete_window = Toplevel(self.window)
@@ -942,9 +2040,8 @@ class SavingsStatsWindow:
 
     def submit_delete_expense(self, expense_id, window):
         # Implement the logic to delete a saving from the database
-        self.database.delete_expense(self.user_id, expense_id)
-        window.destroy()
-        messagebox.showinfo("Success", "Expense deleted successfully.")
+        self.executor.submit(self.database.delete_expense, self.user_id, expense_id,
+                             on_done=lambda _: self.finish_write(window, "Expense deleted successfully."))
     
 
     def edit_expense(self):
@@ -971,29 +2068,23 @@ class SavingsStatsWindow:
     def submit_edit_expense(self, expense_id, new_amount, new_purpose, window):
         print("test")
         # Implement the logic to edit a saving in the database
-        self.database.edit_expense(self.user_id, expense_id, new_amount, new_purpose)
-        window.destroy()
-        messagebox.showinfo("Success", "Saving edited successfully.")
+        self.executor.submit(self.database.edit_expense, self.user_id, expense_id, new_amount, new_purpose,
+                             on_done=lambda _: self.finish_write(window, "Saving edited successfully."))
 
     def open_savings_info(self):
-        self.window.destroy()  # Close the dashboard window
-        SavingsWindow(self.database, self.user_id)
+        self.app.show(SavingsWindow)
 
-class ChallengesWindow:
-    def __init__(self, database, user_id):
-        self.database = database
-        self.user_id = user_id
-        self.window = tk.Tk()
-        self.window.title("Challenges View")
-        self.window.geometry("1200x1200")
+class ChallengesWindow(Screen):
+    title = "Challenges View"
+    geometry = "1200x1200"
 
+    def __init__(self, app, database, user_id=None):
+        super().__init__(app, database, user_id)
         self.create_widgets()
         self.display_challenges()
-        self.window.mainloop()
 
     def create_widgets(self):
-        menubar = Menu(self.window)
-        self.window.config(menu=menubar)
+        menubar = self.menubar
         menubar.add_command(label="Back to Dashboard", command=self.back_to_dashboard)
         menubar.add_command(label="Select New challenges", command=self.challenge_selection)
 
@@ -1012,62 +2103,72 @@ class ChallengesWindow:
         self.challenges_tree.pack(expand=True, fill='both')
 
     def display_challenges(self):
-        try:
-            challenges = self.database.get_user_challenges(self.user_id)
-            for challenge in challenges:
-                self.challenges_tree.insert('', 'end', values=challenge)
-        except Exception as e:
-            tk.messagebox.showerror("Error", f"An error occurred while fetching challenges: {e}")
+        self.executor.submit(self.database.get_user_challenges, self.user_id,
+                             on_done=self.show_challenges,
+                             on_error=lambda e: tk.messagebox.showerror("Error", f"An error occurred while fetching challenges: {e}"),
+                             cancellable=True)
+
+    def on_show(self):
+        self.clear_treeview()
+        self.display_challenges()
+
+    def show_challenges(self, challenges):
+        for challenge in challenges:
+            # Rows are keyed by ChallengeID so a write can patch just its own row
+            if not self.challenges_tree.exists(challenge[0]):
+                self.challenges_tree.insert('', 'end', iid=challenge[0], values=challenge)
 
     def challenge_selection(self):
-        self.window.destroy()
-        SelectChallengeWindow(self.database, self.user_id)
+        self.app.show(SelectChallengeWindow)
 
     def on_challange_select(self, event):
-        selected_item = self.challenges_tree.selection()[0]
+        selection = self.challenges_tree.selection()
+        if not selection:
+            return
+        selected_item = selection[0]
         challenge_id = self.challenges_tree.item(selected_item)['values'][0]
         challenge_name = self.challenges_tree.item(selected_item)['values'][1]
 
         if tk.messagebox.askyesno("Remove Challenge", f"Do you want to remove the challenge '{challenge_name}'?"):
-            try:
-                self.database.remove_user_from_challenge(self.user_id, challenge_id)
+            def removed(_):
                 tk.messagebox.showinfo("Success", f"You have successfully removed the challenge '{challenge_name}'")
 
-                # Refresh the TreeView
-                self.clear_treeview()
-                self.display_challenges()
+                # Drop just that row instead of refetching the list
+                if self.challenges_tree.exists(selected_item):
+                    self.challenges_tree.delete(selected_item)
 
-            except Exception as e:
-                tk.messagebox.showerror("Error", f"An error occurred: {e}")
+            self.executor.submit(self.database.remove_user_from_challenge, self.user_id, challenge_id, on_done=removed)
     def clear_treeview(self):
         for item in self.challenges_tree.get_children():
             self.challenges_tree.delete(item)
 
     def back_to_dashboard(self):
-        self.window.destroy()
-        DashboardWindow(self.database, self.user_id)
+        self.app.show(DashboardWindow)
 
-class SelectChallengeWindow:
-    def __init__(self, database, user_id):
-        self.database = database
-        self.user_id = user_id
-        self.window = tk.Tk()
-        self.window.title("Challenge Select")
-        self.window.geometry("1200x1200")
+class SelectChallengeWindow(Screen):
+    title = "Challenge Select"
+    geometry = "1200x1200"
 
+    def __init__(self, app, database, user_id=None):
+        super().__init__(app, database, user_id)
         self.create_widgets()
         self.display_challenges()
-        self.window.mainloop()
 
     def create_widgets(self):
-        menubar = Menu(self.window)
-        self.window.config(menu=menubar)
+        menubar = self.menubar
         menubar.add_command(label="Back to Dashboard", command=self.back_to_dashboard)
         menubar.add_command(label="View Your Challenges", command=self.View_your_Challenges_window)
 
         tk.Label(self.window, text="Challenge View", font=("Arial", 24)).pack(pady=20)
-
-        self.challenges_tree = ttk.Treeview(self.window, columns=('ChallengeID', 'Name', 'Description', 'StartDate', 'EndDate', 'TargetAmount'), show='headings')
+        self.search_text = ""
+        self.search_entry = DebouncedEntry(self.window, "Search:", self.apply_search)
+        self.search_entry.pack(pady=5)
+
+        # Treeview for displaying challenges, paged by name
+        self.challenges_tree = VirtualTreeview(self.window, ('ChallengeID', 'Name', 'Description', 'StartDate', 'EndDate', 'TargetAmount'),
+                                               self.fetch_challenges,
+                                               executor=self.executor, keyset=True,
+                                               on_error=lambda e: tk.messagebox.showerror("Error", f"An error occurred while fetching challenges: {e}"))
         self.challenges_tree.heading('ChallengeID', text='Challenge ID')
         self.challenges_tree.heading('Name', text='Name')
         self.challenges_tree.heading('Description', text='Description')
@@ -1082,57 +2183,55 @@ class SelectChallengeWindow:
         self.challenges_tree.pack(expand=True, fill='both')
 
     def View_your_Challenges_window(self):
-        self.window.destroy()
-        ChallengesWindow(self.database, self.user_id)
+        self.app.show(ChallengesWindow)
     def display_challenges(self):
-        try:
-            challenges = self.database.get_challenges_user_not_member_of(self.user_id)
-            for challenge in challenges:
-                self.challenges_tree.insert('', 'end', values=challenge)
-        except Exception as e:
-            tk.messagebox.showerror("Error", f"An error occurred while fetching challenges: {e}")
+        self.challenges_tree.reload(limit=SEARCH_RESULT_LIMIT if self.search_text else None)
 
-    def back_to_dashboard(self):
-        self.window.destroy()
-        DashboardWindow(self.database, self.user_id)
+    def fetch_challenges(self, last, limit):
+        # Browsing pages through every challenge by name; a search shows one page of ranked matches
+        if self.search_text:
+            return self.database.search_challenges(self.user_id, self.search_text, limit)
+        return self.database.get_challenges_user_not_member_of(self.user_id, limit, after=last and (last[1], last[0]))
 
-    def clear_treeview(self):
-        for item in self.challenges_tree.get_children():
-            self.challenges_tree.delete(item)
+    def apply_search(self, text):
+        self.search_text = text
+        self.display_challenges()
+
+    def on_show(self):
+        self.display_challenges()
+
+    def back_to_dashboard(self):
+        self.app.show(DashboardWindow)
 
     def on_challange_select(self, event):
-        selected_item = self.challenges_tree.selection()[0]
+        selection = self.challenges_tree.selection()
+        if not selection:
+            return
+        selected_item = selection[0]
         challenge_id = self.challenges_tree.item(selected_item)['values'][0]
         challenge_name = self.challenges_tree.item(selected_item)['values'][1]
 
         if tk.messagebox.askyesno("Join Challenge", f"Do you want to join the challenge '{challenge_name}'?"):
-            try:
-                self.database.add_user_to_challenge(self.user_id, challenge_id)
+            def joined(_):
                 tk.messagebox.showinfo("Success", f"You have successfully joined the challenge '{challenge_name}'")
 
-                # Refresh the TreeView
-                self.clear_treeview()
-                self.display_challenges()
+                # The joined challenge no longer belongs in this list
+                self.challenges_tree.delete_row(selected_item)
 
-            except Exception as e:
-                tk.messagebox.showerror("Error", f"An error occurred: {e}")
+            self.executor.submit(self.database.add_user_to_challenge, self.user_id, challenge_id, on_done=joined)
 
-class GroupWindow:
-    def __init__(self, database, user_id):
-        self.database = database
-        self.user_id = user_id
-        self.window = tk.Tk()
-        self.window.title("Goals View")
-        self.window.geometry("1200x1200")  # Adjust the size as needed
+class GroupWindow(Screen):
+    title = "Goals View"
+    geometry = "1200x1200"
 
+    def __init__(self, app, database, user_id=None):
+        super().__init__(app, database, user_id)
         self.create_widgets()
         self.display_goals()
-        self.window.mainloop()
 
     def create_widgets(self):
         # Menu bar setup
-        menubar = Menu(self.window)
-        self.window.config(menu=menubar)
+        menubar = self.menubar
         menubar.add_command(label="Back to Dashboard", command=self.back_to_dashboard)
         menubar.add_command(label="Select New Group", command=self.get_new_groups)
         group_management_menu = Menu(menubar, tearoff=0)
@@ -1157,45 +2256,61 @@ class GroupWindow:
         self.goals_tree.pack(expand=True, fill='both')
 
     def display_goals(self):
-        try:
-            group_goals = self.database.get_group_goals(self.user_id)
-            for goal in group_goals:
-                # Each 'goal' should have GroupID, GroupName, GroupGoal, CurrentGroupSavings
-                self.goals_tree.insert('', 'end', values=goal)
-        except Exception as e:
-            tk.messagebox.showerror("Error", f"An error occurred while fetching goals: {e}")
+        self.executor.submit(self.database.get_group_goals, self.user_id,
+                             on_done=self.show_goals,
+                             on_error=lambda e: tk.messagebox.showerror("Error", f"An error occurred while fetching goals: {e}"),
+                             cancellable=True)
+
+    def show_goals(self, group_goals):
+        for goal in group_goals:
+            # Each 'goal' should have GroupID, GroupName, GroupGoal, CurrentGroupSavings
+            self.put_goal(goal)
+
+    def put_goal(self, goal):
+        # Rows are keyed by GroupID, so the row a write returns replaces its item in place
+        if self.goals_tree.exists(goal[0]):
+            self.goals_tree.item(goal[0], values=goal)
+        else:
+            self.goals_tree.insert('', 'end', iid=goal[0], values=goal)
+
+    def remove_goal(self, group_id):
+        if self.goals_tree.exists(group_id):
+            self.goals_tree.delete(group_id)
 
     def clear_treeview(self):
         for item in self.goals_tree.get_children():
             self.goals_tree.delete(item)
 
+    def on_show(self):
+        self.clear_treeview()
+        self.display_goals()
+
     def on_goal_select(self, event):
-        selected_item = self.goals_tree.selection()[0]
+        selection = self.goals_tree.selection()
+        if not selection:
+            return
+        selected_item = selection[0]
         group_id = self.goals_tree.item(selected_item)['values'][0]
-        self.add_contribution(group_id)
+        group_name = self.goals_tree.item(selected_item)['values'][1]
+        self.add_contribution(group_id, group_name)
 
-    def add_contribution(self, group_id):
-        amount = simpledialog.askfloat("Contribution", f"Enter contribution amount for {self.database.get_group_name(group_id)}:", parent=self.window)
+    def add_contribution(self, group_id, group_name):
+        # The group name comes from the selected row, so the dialog opens without a query
+        amount = simpledialog.askfloat("Contribution", f"Enter contribution amount for {group_name}:", parent=self.window)
         if amount is not None:
-            try:
-                self.database.add_contribution_to_group(group_id, amount)
+            def contributed(group):
                 tk.messagebox.showinfo("Success", "Contribution added successfully")
+                if group is not None:
+                    self.put_goal(group)
 
-                # Refresh the TreeView
-                self.clear_treeview()
-                self.display_goals()
-
-            except Exception as e:
-                tk.messagebox.showerror("Error", f"An error occurred: {e}")
+            self.executor.submit(self.database.add_contribution_to_group, self.user_id, group_id, amount, on_done=contributed)
 
     def get_new_groups(self):
-        self.window.destroy()  # Close the savings window
-        SelectGroupWindow(self.database, self.user_id)
+        self.app.show(SelectGroupWindow)
 
 
     def back_to_dashboard(self):
-        self.window.destroy()  # Close the savings window
-        DashboardWindow(self.database, self.user_id)
+        self.app.show(DashboardWindow)
 
     def create_group(self):
         def submit():
@@ -1204,14 +2319,12 @@ class GroupWindow:
             group_goal = goal_entry.get()
             # Validate inputs...
 
-            try:
-                self.database.create_group(self.user_id, group_name, description, group_goal)
+            def created(group):
                 tk.messagebox.showinfo("Success", "Group created successfully")
                 create_window.destroy()
-                self.clear_treeview()
-                self.display_goals()
-            except Exception as e:
-                tk.messagebox.showerror("Error", f"An error occurred: {e}")
+                self.put_goal(group)
+
+            self.executor.submit(self.database.create_group, self.user_id, group_name, description, group_goal, on_done=created)
 
         create_window = Toplevel(self.window)
         create_window.title("Create Group")
@@ -1246,14 +2359,13 @@ class GroupWindow:
             new_group_goal = goal_entry.get()
             # Validate inputs...
 
-            try:
-                self.database.edit_group(self.user_id, group_id, new_group_name, new_description, new_group_goal)
+            def updated(group):
                 tk.messagebox.showinfo("Success", "Group updated successfully")
                 edit_window.destroy()
-                self.clear_treeview()
-                self.display_goals()
-            except Exception as e:
-                tk.messagebox.showerror("Error", f"An error occurred: {e}")
+                self.put_goal(group)
+
+            self.executor.submit(self.database.edit_group, self.user_id, group_id, new_group_name, new_description, new_group_goal,
+                                 on_done=updated)
 
         edit_window = Toplevel(self.window)
         edit_window.title("Edit Group")
@@ -1284,39 +2396,39 @@ class GroupWindow:
         group_name = self.goals_tree.item(selected_item[0])['values'][1]
 
         if tk.messagebox.askyesno("Delete Group", f"Are you sure you want to delete the group '{group_name}'?"):
-            try:
-                self.database.delete_group(self.user_id, group_id)
+            def deleted(group_id):
                 tk.messagebox.showinfo("Success", "Group deleted successfully")
-                self.clear_treeview()
-                self.display_goals()
-            except Exception as e:
-                tk.messagebox.showerror("Error", f"An error occurred: {e}")
+                self.remove_goal(group_id)
 
+            self.executor.submit(self.database.delete_group, self.user_id, group_id, on_done=deleted)
 
-class SelectGroupWindow:
-    def __init__(self, database, user_id):
-        self.database = database
-        self.user_id = user_id
-        self.window = tk.Tk()
-        self.window.title("Goals Select")
-        self.window.geometry("1200x1200")  # Adjust the size as needed
 
+class SelectGroupWindow(Screen):
+    title = "Goals Select"
+    geometry = "1200x1200"
+
+    def __init__(self, app, database, user_id=None):
+        super().__init__(app, database, user_id)
         self.create_widgets()
         self.display_goals()
-        self.window.mainloop()
 
     def create_widgets(self):
         # Menu bar setup
-        menubar = Menu(self.window)
-        self.window.config(menu=menubar)
+        menubar = self.menubar
         menubar.add_command(label="Back to Dashboard", command=self.back_to_dashboard)
         menubar.add_command(label="View Your Groups", command=self.View_your_groups_window)
 
 
         tk.Label(self.window, text="Group View", font=("Arial", 24)).pack(pady=20)
-
-        # Treeview for displaying goals
-        self.goals_tree = ttk.Treeview(self.window, columns=('GroupID', 'GroupName', 'Description', 'GroupGoal', 'NumUsers'), show='headings')
+        self.search_text = ""
+        self.search_entry = DebouncedEntry(self.window, "Search:", self.apply_search)
+        self.search_entry.pack(pady=5)
+
+        # Treeview for displaying goals, paged by name
+        self.goals_tree = VirtualTreeview(self.window, ('GroupID', 'GroupName', 'Description', 'GroupGoal', 'NumUsers'),
+                                          self.fetch_groups,
+                                          executor=self.executor, keyset=True,
+                                          on_error=lambda e: tk.messagebox.showerror("Error", f"An error occurred while fetching groups: {e}"))
         self.goals_tree.heading('GroupID', text='Group ID')
         self.goals_tree.heading('GroupName', text='Group Name')
         self.goals_tree.heading('Description', text='Description')
@@ -1333,142 +2445,147 @@ class SelectGroupWindow:
 
 
     def display_goals(self):
-        try:
-            groups = self.database.get_groups_user_not_member_of(self.user_id)
-            for group in groups:
-                # Each 'group' should have GroupID, GroupName, Description, GroupGoal, NumUsers
-                self.goals_tree.insert('', 'end', values=group)
-        except Exception as e:
-            tk.messagebox.showerror("Error", f"An error occurred while fetching groups: {e}")
+        # Each row has GroupID, GroupName, Description, GroupGoal, NumUsers
+        self.goals_tree.reload(limit=SEARCH_RESULT_LIMIT if self.search_text else None)
 
-    def clear_treeview(self):
-        for item in self.goals_tree.get_children():
-            self.goals_tree.delete(item)
+    def fetch_groups(self, last, limit):
+        # Browsing pages through every group by name; a search shows one page of ranked matches
+        if self.search_text:
+            return self.database.search_groups(self.user_id, self.search_text, limit)
+        return self.database.get_groups_user_not_member_of(self.user_id, limit, after=last and (last[1], last[0]))
+
+    def apply_search(self, text):
+        self.search_text = text
+        self.display_goals()
+
+    def on_show(self):
+        self.display_goals()
 
     def on_goal_select(self, event):
-        selected_item = self.goals_tree.selection()[0]
+        selection = self.goals_tree.selection()
+        if not selection:
+            return
+        selected_item = selection[0]
         group_id = self.goals_tree.item(selected_item)['values'][0]
         group_name = self.goals_tree.item(selected_item)['values'][1]
 
         if tk.messagebox.askyesno("Join Group", f"Do you want to join the group '{group_name}'?"):
-            try:
-                self.database.add_user_to_group(self.user_id, group_id)
+            def joined(_):
                 tk.messagebox.showinfo("Success", f"You have successfully joined the group '{group_name}'")
 
-                # Refresh the TreeView
-                self.clear_treeview()
-                self.display_goals()
+                # The joined group no longer belongs in this list
+                self.goals_tree.delete_row(selected_item)
 
-            except Exception as e:
-                tk.messagebox.showerror("Error", f"An error occurred: {e}")
+            self.executor.submit(self.database.add_user_to_group, self.user_id, group_id, on_done=joined)
 
     def View_your_groups_window(self):
-        self.window.destroy()
-        GroupWindow(self.database, self.user_id)
+        self.app.show(GroupWindow)
 
 
     def back_to_dashboard(self):
-        self.window.destroy()  # Close the savings window
-        DashboardWindow(self.database, self.user_id)
-class DashboardWindow:
-    def __init__(self, database, user_id):
-        self.database = database
-        self.user_id = user_id
-        self.dashboard = tk.Tk()
-        self.dashboard.title("Dashboard")
-        self.dashboard.geometry("800x600")
+        self.app.show(DashboardWindow)
+class DashboardWindow(Screen):
+    title = "Dashboard"
+    geometry = "800x600"
 
+    def __init__(self, app, database, user_id=None):
+        super().__init__(app, database, user_id)
         self.create_widgets()
-        self.dashboard.mainloop()
+
+    def on_show(self):
+        self.executor.submit(self.get_net_worth, on_done=self.show_net_worth, cancellable=True)
+
     def get_net_worth(self):
         net_worth = self.database.get_total_net_worth_for_user(self.user_id)
         return net_worth
     def create_widgets(self):
-        user_info = self.database.get_user_info(self.user_id)
-        if user_info is None:
-            messagebox.showerror("Error", "Unable to retrieve user information.")
-            return
-        net_worth = self.get_net_worth()
-        if net_worth is not None:
-            net_worth_label = tk.Label(self.dashboard, text=f"Your Net Worth: {net_worth}", font=("Arial", 16), bg="#FFDAB9")
-            net_worth_label.pack(pady=10, fill='x')
-        else:
-            messagebox.showerror("Error", "Unable to retrieve net worth information.")
+        # User info and net worth load concurrently on worker threads; the labels and the
+        # account menu are filled in as each result arrives
+        self.executor.submit(self.database.get_user_info, self.user_id, on_done=self.show_user_info, cancellable=True)
+        self.executor.submit(self.get_net_worth, on_done=self.show_net_worth, cancellable=True)
+
+        self.net_worth_label = tk.Label(self.window, text="Your Net Worth: ...", font=("Arial", 16), bg="#FFDAB9")
+        self.net_worth_label.pack(pady=10, fill='x')
         # Add logout dropdown menu
         def logout():
             response = messagebox.askyesno("Logout", "Are you sure you want to log out?")
             if response:
-                self.dashboard.destroy()  # Close the dashboard window
-                open_login_window()# Open the login window
+                self.app.logout()
 
         # Create a menubar
-        menubar = Menu(self.dashboard)
-        self.dashboard.config(menu=menubar)
+        menubar = self.menubar
 
         # Create a menu
         user_menu = Menu(menubar, tearoff=0)
-        menubar.add_cascade(label=f"{user_info[1]} {user_info[2]}", menu=user_menu)
+        menubar.add_cascade(label="Account", menu=user_menu)
+        self.account_menu_index = menubar.index(tk.END)  # relabelled with the user's name once loaded
         user_menu.add_command(label="Log out", command=logout)
+        self.menubar = menubar
 
         # Welcome label
-        welcome_label = tk.Label(self.dashboard, text=f"Welcome {user_info[1]}", font=("Arial", 24), bg="#FFDAB9")
-        welcome_label.pack(pady=20, fill='x')
+        self.welcome_label = tk.Label(self.window, text="Welcome", font=("Arial", 24), bg="#FFDAB9")
+        self.welcome_label.pack(pady=20, fill='x')
 
         # Button style configuration
         button_style = {'font': ("Arial", 16), 'border': 0, 'bg': "#FFA07A", 'activebackground': "#FF7F50", 'padx': 10, 'pady': 5}
 
         # View Savings Button
-        view_savings_button = tk.Button(self.dashboard, text="View Savings", **button_style, command=self.open_savings_window)
+        view_savings_button = tk.Button(self.window, text="View Savings", **button_style, command=self.open_savings_window)
         view_savings_button.pack(pady=10, ipadx=50, ipady=10)
 
         # View Goals Button
-        view_goals_button = tk.Button(self.dashboard, text="View Challenges", **button_style, command=self.open_challenges_window)
+        view_goals_button = tk.Button(self.window, text="View Challenges", **button_style, command=self.open_challenges_window)
         view_goals_button.pack(pady=10, ipadx=50, ipady=10)
 
         # View Projections Button
-        view_projections_button = tk.Button(self.dashboard, text="View Projections", **button_style)
+        view_projections_button = tk.Button(self.window, text="View Projections", **button_style)
         view_projections_button.pack(pady=10, ipadx=50, ipady=10)
 
         # Inbox Button
-        leader_button = tk.Button(self.dashboard, text="Leader Board", **button_style, command=self.open_leaderboard_window)
+        leader_button = tk.Button(self.window, text="Leader Board", **button_style, command=self.open_leaderboard_window)
         leader_button.pack(pady=10, ipadx=50, ipady=10)
 
-        leader_button = tk.Button(self.dashboard, text="View Groups", **button_style, command=self.open_groups_window)
+        leader_button = tk.Button(self.window, text="View Groups", **button_style, command=self.open_groups_window)
         leader_button.pack(pady=10, ipadx=50, ipady=10)
 
+    def show_user_info(self, user_info):
+        if user_info is None:
+            messagebox.showerror("Error", "Unable to retrieve user information.")
+            return
+        self.menubar.entryconfig(self.account_menu_index, label=f"{user_info[1]} {user_info[2]}")
+        self.welcome_label.config(text=f"Welcome {user_info[1]}")
+
+    def show_net_worth(self, net_worth):
+        if net_worth is not None:
+            self.net_worth_label.config(text=f"Your Net Worth: {net_worth}")
+        else:
+            messagebox.showerror("Error", "Unable to retrieve net worth information.")
+
     def open_groups_window(self):
-        self.dashboard.destroy()
-        GroupWindow(self.database, self.user_id)
+        self.app.show(GroupWindow)
 
     def open_leaderboard_window(self):
-        self.dashboard.destroy()
-        OverallPlacementWindow(self.database, self.user_id)
+        self.app.show(OverallPlacementWindow)
 
     def open_savings_window(self):
-        self.dashboard.destroy()  # Close the dashboard window
-        SavingsWindow(self.database, self.user_id)  # Open the savings window
+        self.app.show(SavingsWindow)
 
     def open_challenges_window(self):
-        self.dashboard.destroy()  # Close the dashboard window
-        ChallengesWindow(self.database, self.user_id)  # Open the challenges window
+        self.app.show(ChallengesWindow)
 
 
 
 
-class SavingsLeaderboardWindow:
-    def __init__(self, database, user_id):
-        self.database = database
-        self.user_id = user_id
-        self.window = tk.Tk()
-        self.window.title("Savings Leaderboard")
-        self.window.geometry("1200x1200")  # Adjust the size as needed
+class SavingsLeaderboardWindow(Screen):
+    title = "Savings Leaderboard"
+    geometry = "1200x1200"
 
+    def __init__(self, app, database, user_id=None):
+        super().__init__(app, database, user_id)
         self.create_widgets()
         self.load_leaderboard_data("all")
-        self.window.mainloop()
     def create_widgets(self):
-        menubar = Menu(self.window)
-        self.window.config(menu=menubar)
+        menubar = self.menubar
 
         # Leaderboard options menu
         leaderboard_menu = Menu(menubar, tearoff=0)
@@ -1491,7 +2608,9 @@ class SavingsLeaderboardWindow:
         tk.Button(buttons_frame, text="Refresh", command=lambda: self.load_leaderboard_data("all")).pack(side=tk.RIGHT)
 
         # Treeview for displaying leaderboard
-        self.leaderboard_tree = ttk.Treeview(self.window, columns=("Rank", "UserID", "FirstName", "LastName", "TotalSavings"), show='headings')
+        self.leaderboard_tree = VirtualTreeview(self.window, ("Rank", "UserID", "FirstName", "LastName", "TotalSavings"),
+                                                lambda offset, limit: self.database.get_savings_leaderboard_data(limit, offset), page_size=LEADERBOARD_PAGE_SIZE,
+                                                executor=self.executor)
         self.leaderboard_tree.column("Rank", width=50)
         self.leaderboard_tree.column("UserID", width=100)
         self.leaderboard_tree.column("FirstName", width=150)
@@ -1507,63 +2626,40 @@ class SavingsLeaderboardWindow:
         self.leaderboard_tree.pack(side="left", fill="both", expand=True, padx=10, pady=10)
 
     def load_leaderboard_data(self, limit):
-        # Clear the treeview
-        for i in self.leaderboard_tree.get_children():
-            self.leaderboard_tree.delete(i)
-
-        # Fetch leaderboard data from the database
-        leaderboard_data = self.database.get_savings_leaderboard_data()
-
-        # Sort the data based on TotalSavings in descending order
-        sorted_data = sorted(leaderboard_data, key=lambda x: x[-1], reverse=True)
+        # Rows arrive ranked and sorted from the database. Top N views fetch exactly N rows;
+        # 'all' pages in as the user scrolls
+        self.limit = limit
+        self.leaderboard_tree.reload(limit=LEADERBOARD_LIMITS.get(limit))
 
-        # Apply limit
-        if limit == "top10":
-            sorted_data = sorted_data[:10]
-        elif limit == "top50":
-            sorted_data = sorted_data[:50]
-        elif limit == "top100":
-            sorted_data = sorted_data[:100]
-        # 'all' will show all entries
-
-        # Insert sorted data into the treeview
-        for index, item in enumerate(sorted_data, start=1):
-            self.leaderboard_tree.insert('', tk.END, values=(index,) + item)
+    def on_show(self):
+        self.load_leaderboard_data(self.limit)
 
     # Placeholder methods for menu commands
     def back_to_dashboard(self):
-        self.window.destroy()  # Close the savings window
-        DashboardWindow(self.database, self.user_id)
+        self.app.show(DashboardWindow)
 
     def overall_placement(self):
-        self.window.destroy()
-        OverallPlacementWindow(self.database, self.user_id)  # Implement the functionality
+        self.app.show(OverallPlacementWindow)
 
     def expenses_leaderboard(self):
-        self.window.destroy()
-        ExpenseLeaderboardWindow(self.database, self.user_id)  # Implement the functionality
+        self.app.show(ExpenseLeaderboardWindow)
 
     def net_worth_leaderboard(self):
-        self.window.destroy()
-        NetWorthLeaderboardWindow(self.database, self.user_id)
+        self.app.show(NetWorthLeaderboardWindow)
 
 
-class ExpenseLeaderboardWindow:
-    def __init__(self, database, user_id):
-        self.database = database
-        self.user_id = user_id
-        self.window = tk.Tk()
-        self.window.title("Expense Leaderboard")
-        self.window.geometry("1200x1200")  # Adjust the size as needed
+class ExpenseLeaderboardWindow(Screen):
+    title = "Expense Leaderboard"
+    geometry = "1200x1200"
 
+    def __init__(self, app, database, user_id=None):
+        super().__init__(app, database, user_id)
         self.create_widgets()
         self.load_leaderboard_data("all")
-        self.window.mainloop()
 
     def create_widgets(self):
         # Menu bar setup
-        menubar = Menu(self.window)
-        self.window.config(menu=menubar)
+        menubar = self.menubar
 
         # Leaderboard options menu
         leaderboard_menu = Menu(menubar, tearoff=0)
@@ -1585,7 +2681,9 @@ class ExpenseLeaderboardWindow:
         tk.Button(buttons_frame, text="Show All", command=lambda: self.load_leaderboard_data("all")).pack(side=tk.LEFT)
         tk.Button(buttons_frame, text="Refresh", command=lambda: self.load_leaderboard_data("all")).pack(side=tk.RIGHT)
 
-        self.leaderboard_tree = ttk.Treeview(self.window, columns=("Rank", "UserID", "FirstName", "LastName", "TotalExpense"), show='headings')
+        self.leaderboard_tree = VirtualTreeview(self.window, ("Rank", "UserID", "FirstName", "LastName", "TotalExpense"),
+                                                lambda offset, limit: self.database.get_expense_leaderboard_data(limit, offset), page_size=LEADERBOARD_PAGE_SIZE,
+                                                executor=self.executor)
         self.leaderboard_tree.column("Rank", width=50)
         self.leaderboard_tree.column("UserID", width=100)
         self.leaderboard_tree.column("FirstName", width=150)
@@ -1601,63 +2699,40 @@ class ExpenseLeaderboardWindow:
         self.leaderboard_tree.pack(side="left", fill="both", expand=True, padx=10, pady=10)
 
     def load_leaderboard_data(self, limit):
-        # Clear the treeview
-        for i in self.leaderboard_tree.get_children():
-            self.leaderboard_tree.delete(i)
-
-        # Fetch leaderboard data from the database
-        leaderboard_data = self.database.get_expense_leaderboard_data()
-
-        # Sort the data based on TotalSavings in descending order
-        sorted_data = sorted(leaderboard_data, key=lambda x: x[-1], reverse=True)
+        # Rows arrive ranked and sorted from the database. Top N views fetch exactly N rows;
+        # 'all' pages in as the user scrolls
+        self.limit = limit
+        self.leaderboard_tree.reload(limit=LEADERBOARD_LIMITS.get(limit))
 
-        # Apply limit
-        if limit == "top10":
-            sorted_data = sorted_data[:10]
-        elif limit == "top50":
-            sorted_data = sorted_data[:50]
-        elif limit == "top100":
-            sorted_data = sorted_data[:100]
-        # 'all' will show all entries
-
-        # Insert sorted data into the treeview
-        for index, item in enumerate(sorted_data, start=1):
-            self.leaderboard_tree.insert('', tk.END, values=(index,) + item)
+    def on_show(self):
+        self.load_leaderboard_data(self.limit)
 
     # Placeholder methods for menu commands
     def back_to_dashboard(self):
-        self.window.destroy()  # Close the savings window
-        DashboardWindow(self.database, self.user_id)
+        self.app.show(DashboardWindow)
 
     def overall_placement(self):
-        self.window.destroy()
-        OverallPlacementWindow(self.database, self.user_id)  # Implement the functionality
+        self.app.show(OverallPlacementWindow)
 
     def savings_leaderboard(self):
-        self.window.destroy()
-        SavingsLeaderboardWindow(self.database, self.user_id)  # Implement the functionality
+        self.app.show(SavingsLeaderboardWindow)
 
     def net_worth_leaderboard(self):
-        self.window.destroy()
-        NetWorthLeaderboardWindow(self.database, self.user_id)
+        self.app.show(NetWorthLeaderboardWindow)
 
 
-class NetWorthLeaderboardWindow:
-    def __init__(self, database, user_id):
-        self.database = database
-        self.user_id = user_id
-        self.window = tk.Tk()
-        self.window.title("Net Worth Leaderboard")
-        self.window.geometry("1200x1200")  # Adjust the size as needed
+class NetWorthLeaderboardWindow(Screen):
+    title = "Net Worth Leaderboard"
+    geometry = "1200x1200"
 
+    def __init__(self, app, database, user_id=None):
+        super().__init__(app, database, user_id)
         self.create_widgets()
         self.load_leaderboard_data("all")
-        self.window.mainloop()
 
     def create_widgets(self):
         # Menu bar setup
-        menubar = Menu(self.window)
-        self.window.config(menu=menubar)
+        menubar = self.menubar
 
         # Leaderboard options menu
         leaderboard_menu = Menu(menubar, tearoff=0)
@@ -1680,7 +2755,9 @@ class NetWorthLeaderboardWindow:
         tk.Button(buttons_frame, text="Refresh", command=lambda: self.load_leaderboard_data("all")).pack(side=tk.RIGHT)
 
         # Treeview for displaying leaderboard
-        self.leaderboard_tree = ttk.Treeview(self.window, columns=("Rank", "UserID", "FirstName", "LastName", "NetWorth"), show='headings')
+        self.leaderboard_tree = VirtualTreeview(self.window, ("Rank", "UserID", "FirstName", "LastName", "NetWorth"),
+                                                lambda offset, limit: self.database.get_net_worth_leaderboard_data(limit, offset), page_size=LEADERBOARD_PAGE_SIZE,
+                                                executor=self.executor)
         self.leaderboard_tree.column("Rank", width=50)
         self.leaderboard_tree.column("UserID", width=100)
         self.leaderboard_tree.column("FirstName", width=150)
@@ -1696,62 +2773,39 @@ class NetWorthLeaderboardWindow:
         self.leaderboard_tree.pack(side="left", fill="both", expand=True, padx=10, pady=10)
 
     def load_leaderboard_data(self, limit):
-        # Clear the treeview
-        for i in self.leaderboard_tree.get_children():
-            self.leaderboard_tree.delete(i)
+        # Rows arrive ranked and sorted from the database. Top N views fetch exactly N rows;
+        # 'all' pages in as the user scrolls
+        self.limit = limit
+        self.leaderboard_tree.reload(limit=LEADERBOARD_LIMITS.get(limit))
 
-        # Fetch leaderboard data from the database
-        leaderboard_data = self.database.get_net_worth_leaderboard_data()
-
-        # Sort the data based on NetWorth in descending order
-        sorted_data = sorted(leaderboard_data, key=lambda x: x[-1], reverse=True)
-
-        # Apply limit
-        if limit == "top10":
-            sorted_data = sorted_data[:10]
-        elif limit == "top50":
-            sorted_data = sorted_data[:50]
-        elif limit == "top100":
-            sorted_data = sorted_data[:100]
-        # 'all' will show all entries
-
-        # Insert sorted data into the treeview
-        for index, item in enumerate(sorted_data, start=1):
-            self.leaderboard_tree.insert('', tk.END, values=(index,) + item)
+    def on_show(self):
+        self.load_leaderboard_data(self.limit)
 
     # Placeholder methods for menu commands
     def back_to_dashboard(self):
-        self.window.destroy()  # Close the savings window
-        DashboardWindow(self.database, self.user_id)
+        self.app.show(DashboardWindow)
 
     def overall_placement(self):
-        self.window.destroy()
-        OverallPlacementWindow(self.database, self.user_id)  # Implement the functionality
+        self.app.show(OverallPlacementWindow)
 
     def savings_leaderboard(self):
-        self.window.destroy()
-        SavingsLeaderboardWindow(self.database, self.user_id)  # Implement the functionality
+        self.app.show(SavingsLeaderboardWindow)
 
     def expenses_leaderboard(self):
-        self.window.destroy()
-        ExpenseLeaderboardWindow(self.database, self.user_id)  # Implement the functionality
+        self.app.show(ExpenseLeaderboardWindow)
 
-class OverallPlacementWindow:
-    def __init__(self, database, user_id):
-        self.database = database
-        self.user_id = user_id
-        self.window = tk.Tk()
-        self.window.title("Overall Placement")
-        self.window.geometry("1200x1200")  # Adjust the size as needed
+class OverallPlacementWindow(Screen):
+    title = "Overall Placement"
+    geometry = "1200x1200"
 
+    def __init__(self, app, database, user_id=None):
+        super().__init__(app, database, user_id)
         self.create_widgets()
         self.load_user_placement()
-        self.window.mainloop()
 
     def create_widgets(self):
         # Menu bar setup
-        menubar = Menu(self.window)
-        self.window.config(menu=menubar)
+        menubar = self.menubar
 
         # Leaderboard options menu
         leaderboard_menu = Menu(menubar, tearoff=0)
@@ -1762,7 +2816,7 @@ class OverallPlacementWindow:
 
         menubar.add_command(label="Back to Dashboard", command=self.back_to_dashboard)
         # Placement label
-        self.placement_label = tk.Label(self.window, text="", font=("Arial", 24))
+        self.placement_label = tk.Label(self.window, text="Loading placement...", font=("Arial", 24))
         self.placement_label.pack(pady=20)
 
         self.placement2_label = tk.Label(self.window, text="", font=("Arial", 24))
@@ -1772,41 +2826,41 @@ class OverallPlacementWindow:
         self.placement3_label.pack(pady=20)
 
 
+    def on_show(self):
+        self.load_user_placement()
+
     def load_user_placement(self):
         # Fetch user's overall placement from the database
-        leaderboard_data = self.database.get_net_worth_leaderboard_data()
-        
-        def find_user_position_in_leaderboard(leaderboard_data, user_id):
-        
-            for position, data in enumerate(leaderboard_data, start=1):
-                if data[0] == user_id:  # Assuming the UserID is the first element in the data tuple
-                    return position
-            return None
-        placement = find_user_position_in_leaderboard(leaderboard_data,self.user_id)
-        total_users = self.database.get_total_number_of_users()
+        self.executor.submit(self.database.get_user_rank, self.user_id, 'net_worth', on_done=self.show_user_placement, cancellable=True)
+
+    def show_user_placement(self, user_rank):
+        if user_rank is None:
+            self.placement_label.config(text="Your Overall Placement: N/A")
+            return
+        placement, total_users, percentile_rank = user_rank
 
         # Update the label with the user's placement
         self.placement_label.config(text=f"Your Overall Placement: {placement}")
         self.placement2_label.config(text=f"{placement} / {total_users}")
-        percentile_rank = ((total_users - placement) / (total_users - 1)) * 100
-        self.placement3_label.config(text=f"Your in the Top {percentile_rank} Percentile")
+        self.placement3_label.config(text=f"Your in the Top {percentile_rank:.2f} Percentile")
         # Placeholder methods for menu commands
     def back_to_dashboard(self):
-        self.window.destroy()  # Close the savings window
-        DashboardWindow(self.database, self.user_id)
+        self.app.show(DashboardWindow)
         
     def savings_leaderboard(self):
-        self.window.destroy()
-        SavingsLeaderboardWindow(self.database, self.user_id)
+        self.app.show(SavingsLeaderboardWindow)
 
     def expenses_leaderboard(self):
-        self.window.destroy()
-        ExpenseLeaderboardWindow(self.database, self.user_id)
+        self.app.show(ExpenseLeaderboardWindow)
 
     def net_worth_leaderboard(self):
-        self.window.destroy()
-        NetWorthLeaderboardWindow(self.database, self.user_id)
+        self.app.show(NetWorthLeaderboardWindow)
 
 if __name__ == "__main__":
     db = Database("savesphere", "postgres", "E8a39ccb71", "127.0.0.1")
-    open_login_window()  # Open the login window directly
+    try:
+        app = App(db)
+        app.show(LoginWindow)  # The login screen applies migrations once painted
+        app.run()
+    finally:
+        db.close()
@@ -0,0 +1,264 @@
+import asyncio
+
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import AsyncConnectionPool
+
+import queries
+from queries import CONTRIBUTION_HISTORY_PAGE_SIZE, DISCOVERY_PAGE_SIZE, RANK_METRIC_COLUMNS, SEARCH_RESULT_LIMIT
+
+# Needs psycopg 3 with its pool (`pip install "psycopg[pool]"`, see requirements.txt);
+# Project.py itself only uses psycopg2.
+
+
+class AsyncDatabase:
+    # asyncio counterpart of Project.Database for headless services and batch jobs.
+    # Method names, arguments and return values match Database; every call borrows a
+    # connection from a shared AsyncConnectionPool, so independent queries can run
+    # concurrently (see get_dashboard_data). Use it as `async with AsyncDatabase(...) as db:`
+    # or call open()/close() explicitly.
+    def __init__(self, dbname, user, password, host, min_connections=1, max_connections=10, idle_timeout=300):
+        self.pool = AsyncConnectionPool(
+            make_conninfo(dbname=dbname, user=user, password=password, host=host),
+            min_size=min_connections,
+            max_size=max_connections,
+            max_idle=idle_timeout,
+            check=AsyncConnectionPool.check_connection,
+            open=False,
+        )
+
+    async def open(self):
+        await self.pool.open()
+
+    async def close(self):
+        await self.pool.close()
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    # The pool's connection context commits on success and rolls back on error
+    async def _fetchone(self, query, params=()):
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(query, params)
+                return await cur.fetchone()
+
+    async def _fetchall(self, query, params=()):
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(query, params)
+                return await cur.fetchall()
+
+    async def _execute(self, query, params=()):
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(query, params)
+                return cur.rowcount
+
+    async def get_user_info(self, user_id):
+        return await self._fetchone(queries.USER_INFO, (user_id,))
+
+    async def login_user(self, email, password):
+        user_record = await self._fetchone(queries.LOGIN_USER, (email,))
+        if user_record and user_record[1] == password:
+            return user_record[0]  # Return the UserID
+        return None
+
+    async def get_user_challenges(self, user_id):
+        return await self._fetchall(queries.USER_CHALLENGES, (user_id,))
+
+    async def get_challenges_user_not_member_of(self, user_id, limit=DISCOVERY_PAGE_SIZE, after=None, prefix=None):
+        return await self._fetchall(queries.challenges_not_joined_query(after, prefix),
+                                    queries.discovery_parameters(user_id, limit, after, prefix))
+
+    async def search_challenges(self, user_id, text, limit=SEARCH_RESULT_LIMIT):
+        query = queries.search_query(text)
+        if query is None:
+            return []
+        return await self._fetchall(queries.SEARCH_CHALLENGES, queries.search_parameters(user_id, query, limit))
+
+    async def get_group_goals(self, user_id):
+        return await self._fetchall(queries.GROUP_GOALS, (user_id,))
+
+    async def get_groups_user_not_member_of(self, user_id, limit=DISCOVERY_PAGE_SIZE, after=None, prefix=None):
+        return await self._fetchall(queries.groups_not_joined_query(after, prefix),
+                                    queries.discovery_parameters(user_id, limit, after, prefix))
+
+    async def search_groups(self, user_id, text, limit=SEARCH_RESULT_LIMIT):
+        query = queries.search_query(text)
+        if query is None:
+            return []
+        return await self._fetchall(queries.SEARCH_GROUPS, queries.search_parameters(user_id, query, limit))
+
+    async def create_group(self, user_id, group_name, description, group_goal):
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(queries.CREATE_GROUP, (group_name, description, group_goal, user_id))
+                group = await cur.fetchone()
+
+                # Associate the creator with the group in UserGroups table
+                await cur.execute(queries.ADD_USER_TO_GROUP, (user_id, group[0]))
+                return group
+
+    async def edit_group(self, user_id, group_id, new_group_name, new_description, new_group_goal):
+        group = await self._fetchone(queries.EDIT_GROUP, (new_group_name, new_description, new_group_goal, group_id, user_id))
+        if group is None:
+            raise Exception("User is not the owner of the group.")
+        return group
+
+    async def delete_group(self, user_id, group_id):
+        result = await self._fetchone(queries.DELETE_GROUP, (group_id, user_id))
+        if result is None:
+            raise Exception("User is not the owner of the group.")
+        return group_id
+
+    async def add_user_to_group(self, user_id, group_id):
+        await self._execute(queries.ADD_USER_TO_GROUP, (user_id, group_id))
+
+    async def add_user_to_challenge(self, user_id, challenge_id):
+        await self._execute(queries.ADD_USER_TO_CHALLENGE, (user_id, challenge_id))
+
+    async def remove_user_from_challenge(self, user_id, challenge_id):
+        result = await self._fetchone(queries.REMOVE_USER_FROM_CHALLENGE, (user_id, challenge_id))
+        return result[0] if result else None
+
+    async def add_contribution_to_group(self, user_id, group_id, amount):
+        return await self._fetchone(queries.ADD_CONTRIBUTION_TO_GROUP, {"user_id": user_id, "group_id": group_id, "amount": amount})
+
+    async def get_group_contributions(self, group_id, limit=CONTRIBUTION_HISTORY_PAGE_SIZE, before=None):
+        return await self._fetchall(queries.GROUP_CONTRIBUTIONS, {"group_id": group_id, "limit": limit, "before": before})
+
+    async def get_group_member_contributions(self, group_id):
+        return await self._fetchall(queries.GROUP_MEMBER_CONTRIBUTIONS, (group_id,))
+
+    async def compact_group_contributions(self, batch_size=10000):
+        return (await self._fetchone(queries.COMPACT_GROUP_CONTRIBUTIONS, (batch_size,)))[0]
+
+    async def get_group_name(self, group_id):
+        result = await self._fetchone(queries.GROUP_NAME, (group_id,))
+        return result[0] if result else None
+
+    async def _get_leaderboard(self, total_column, limit, offset):
+        return await self._fetchall(queries.leaderboard_query(total_column), (limit, offset))
+
+    async def get_savings_leaderboard_data(self, limit=None, offset=0):
+        return await self._get_leaderboard("SavingsTotal", limit, offset)
+
+    async def get_expense_leaderboard_data(self, limit=None, offset=0):
+        return await self._get_leaderboard("ExpensesTotal", limit, offset)
+
+    async def get_net_worth_leaderboard_data(self, limit=None, offset=0):
+        return await self._get_leaderboard("NetWorth", limit, offset)
+
+    async def get_user_rank(self, user_id, metric='net_worth'):
+        column = RANK_METRIC_COLUMNS[metric]
+        result = await self._fetchone(queries.user_rank_query(column), (column, user_id))
+        if result is None:
+            return None
+        rank, total_users = result
+        return rank, total_users, queries.rank_percentile(rank, total_users)
+
+    async def get_total_number_of_users(self):
+        result = await self._fetchone(queries.TOTAL_NUMBER_OF_USERS)
+        return result[0] if result else 0
+
+    async def create_user(self, first_name, last_name, email, password):
+        result = await self._fetchone(queries.CREATE_USER, (first_name.capitalize(), last_name.capitalize(), email, password))
+        return result[0]
+
+    async def add_new_saving(self, user_id, amount, purpose):
+        result = await self._fetchone(queries.ADD_NEW_SAVING, (user_id, amount, purpose))
+        return result[0]
+
+    async def delete_saving(self, user_id, savings_id):
+        rowcount = await self._execute(queries.DELETE_SAVING, (user_id, savings_id))
+        return rowcount > 0  # Returns True if a row was deleted
+
+    async def edit_saving(self, user_id, savings_id, new_amount, new_purpose):
+        rowcount = await self._execute(queries.EDIT_SAVING, (new_amount, new_purpose, user_id, savings_id))
+        return rowcount > 0  # Returns True if a row was updated
+
+    async def add_new_expense(self, user_id, amount, category):
+        await self._execute(queries.ADD_NEW_EXPENSE, (user_id, amount, category))
+
+    async def delete_expense(self, user_id, expense_id):
+        await self._execute(queries.DELETE_EXPENSE, (user_id, expense_id))
+
+    async def edit_expense(self, user_id, expense_id, new_amount, new_category):
+        await self._execute(queries.EDIT_EXPENSE, (new_amount, new_category, user_id, expense_id))
+
+    async def get_user_savings(self, user_id, sort_by='date', order='asc'):
+        return await self._fetchall(queries.sorted_entries_query("Savings", sort_by, order), (user_id,))
+
+    async def get_user_expenses(self, user_id, sort_by='date', order='asc'):
+        return await self._fetchall(queries.sorted_entries_query("Expenses", sort_by, order), (user_id,))
+
+    async def get_user_transactions(self, user_id, sort_by='date', order='asc', filter_type='both', limit=None, offset=0):
+        feed = queries.transactions_query(user_id, sort_by, order, filter_type, limit, offset)
+        if feed is None:
+            return []
+        return await self._fetchall(*feed)
+
+    async def _get_user_total(self, column, user_id, default=0):
+        result = await self._fetchone(queries.user_total_query(column), (user_id,))
+        return result[0] if result else default
+
+    async def get_total_savings(self, user_id):
+        return await self._get_user_total("SavingsTotal", user_id)
+
+    async def get_total_expenses(self, user_id):
+        return await self._get_user_total("ExpensesTotal", user_id)
+
+    async def get_highest_and_lowest_savings(self, user_id):
+        result = await self._fetchone(queries.HIGHEST_AND_LOWEST_SAVINGS, (user_id,))
+        return result or (None, None)
+
+    async def get_highest_and_lowest_expenses(self, user_id):
+        result = await self._fetchone(queries.HIGHEST_AND_LOWEST_EXPENSES, (user_id,))
+        return result or (None, None)
+
+    async def get_number_of_savings_entries(self, user_id):
+        return await self._get_user_total("SavingsCount", user_id)
+
+    async def get_number_of_expenses_entries(self, user_id):
+        return await self._get_user_total("ExpensesCount", user_id)
+
+    async def get_user_stats_snapshot(self, user_id):
+        return queries.user_stats_snapshot(await self._fetchone(queries.USER_STATS_SNAPSHOT, (user_id,)))
+
+    async def get_savings_expenses_over_time(self, user_id):
+        return await self.get_savings_expenses_series(user_id)
+
+    async def get_savings_expenses_span(self, user_id):
+        return await self._fetchone(queries.SAVINGS_EXPENSES_SPAN, {"user_id": user_id})
+
+    async def get_savings_expenses_downsampled(self, user_id, max_points, start=None, end=None):
+        window = queries.downsample_range(await self.get_savings_expenses_span(user_id), max_points, start, end)
+        if window is None:
+            return []
+        bucket, start, end = window
+        return await self.get_savings_expenses_series(user_id, bucket, start=start, end=end)
+
+    async def get_savings_expenses_series(self, user_id, bucket='day', cumulative=False, start=None, end=None):
+        return await self._fetchall(*queries.series_query(user_id, bucket, cumulative, start, end))
+
+    async def get_user_net_savings(self, user_id):
+        result = await self._fetchone(queries.USER_NET_SAVINGS, (user_id,))
+        if result:
+            total_savings, total_expenses = result
+            return total_savings - total_expenses
+        return 0
+
+    async def get_total_net_worth_for_user(self, user_id):
+        return await self._get_user_total("NetWorth", user_id)
+
+    async def get_dashboard_data(self, user_id):
+        # The dashboard's two lookups are independent, so they run on separate pooled connections at once
+        user_info, net_worth = await asyncio.gather(
+            self.get_user_info(user_id),
+            self.get_total_net_worth_for_user(user_id),
+        )
+        return user_info, net_worth
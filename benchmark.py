@@ -0,0 +1,403 @@
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from psycopg2.extensions import make_dsn
+
+import generate_mock_data
+from Project import Database
+
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datbase_schema.sql")
+
+# Number of savings + expense rows seeded for each named scale
+SCALES = {"1k": 1_000, "100k": 100_000, "10M": 10_000_000}
+# Search-as-you-type inputs for the search_* benchmarks
+SEARCH_PREFIXES = ("a", "co", "inc", "sa", "tr", "group", "re")
+# Database methods that are not queries and have no benchmark
+NOT_BENCHMARKED = {"connect", "close", "cache_stats", "apply_migrations"}
+
+
+def scale_counts(transactions):
+    # Keeps the shape of the checked-in mock data: ~20 transactions per user,
+    # savings outnumbering expenses, a couple of memberships per user.
+    users = max(50, transactions // 20)
+    return {
+        "Users": users,
+        "Groups": max(10, users // 10),
+        "Expenses": transactions * 4 // 11,
+        "Savings": transactions - transactions * 4 // 11,
+        "Challenges": max(20, users // 50),
+        "UserGroups": users * 2,
+        "UserChallenges": users,
+    }
+
+
+def is_benchmark_database(dbname):
+    return "bench" in dbname.lower()
+
+
+def reset_database(db, force=False):
+    # Drops everything in the benchmark database. Databases whose name doesn't say
+    # "bench" are refused unless force is set, so a typo can't wipe real data.
+    if not force and not is_benchmark_database(db.dbname):
+        raise SystemExit(f"Refusing to drop the schema of {db.dbname!r}: its name doesn't contain 'bench'. "
+                         "Use --force to wipe it anyway.")
+    with db.connect() as conn:
+        with conn.cursor() as cur:
+            cur.execute("DROP SCHEMA public CASCADE; CREATE SCHEMA public;")
+            with open(SCHEMA_FILE) as schema:
+                cur.execute(schema.read())
+    db.apply_migrations()
+
+
+def seed_database(db, args, counts):
+    profile = generate_mock_data.WorkloadProfile(counts["Users"], args.profile, 1.1, args.seed,
+                                                 generate_mock_data.DEFAULT_END_DATE)
+    dsn = make_dsn(dbname=args.dbname, user=args.user, password=args.password, host=args.host)
+    with ProcessPoolExecutor(args.workers) as executor:
+        tables = [
+            (table_name, generate_mock_data.generate_table_stream(executor, table_name, counts, profile, args.seed,
+                                                                  10000, args.workers * 2))
+            for table_name in generate_mock_data.TABLE_COLUMNS
+        ]
+        generate_mock_data.load_to_database(dsn, tables)
+    with db.connect() as conn:
+        with conn.cursor() as cur:
+            cur.execute("ANALYZE;")
+
+
+class BenchmarkContext:
+    def __init__(self, db, counts):
+        self.db = db
+        self.counts = counts
+        self.savings_ids = []
+        self.expense_ids = []
+        self.groups = []
+        self.challenge_memberships = []
+        with db.connect() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT Email, Password FROM Users ORDER BY UserID LIMIT 1000;")
+                self.logins = cur.fetchall()
+
+    def user(self, rng):
+        return rng.randint(1, self.counts["Users"])
+
+    def group(self, rng):
+        return rng.randint(1, self.counts["Groups"])
+
+
+# Each benchmark picks its arguments (untimed) and returns the call to time. They run
+# in this order, so the edits and deletes work on the rows the adds created; when a
+# subset runs without its add, the ensure_* helpers create a row to work on untimed.
+def bench_add_new_expense(ctx, rng):
+    user_id = ctx.user(rng)
+
+    def call():
+        ctx.db.add_new_expense(user_id, round(rng.uniform(10, 500), 2), "benchmark")
+    return call
+
+
+def prepare_expense_ids(ctx):
+    with ctx.db.connect() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT UserID, ExpenseID FROM Expenses WHERE Category = 'benchmark' ORDER BY ExpenseID;")
+            ctx.expense_ids = cur.fetchall()
+
+
+def ensure_expense_ids(ctx, rng):
+    if not ctx.expense_ids:
+        prepare_expense_ids(ctx)
+    if not ctx.expense_ids:
+        ctx.db.add_new_expense(ctx.user(rng), round(rng.uniform(10, 500), 2), "benchmark")
+        prepare_expense_ids(ctx)
+
+
+def ensure_savings_ids(ctx, rng):
+    if not ctx.savings_ids:
+        user_id = ctx.user(rng)
+        ctx.savings_ids.append((user_id, ctx.db.add_new_saving(user_id, round(rng.uniform(100, 2000), 2), "benchmark")))
+
+
+def ensure_groups(ctx, rng):
+    if not ctx.groups:
+        user_id = ctx.user(rng)
+        ctx.groups.append((user_id, ctx.db.create_group(user_id, "Benchmark group", "benchmark", 10000)[0]))
+
+
+def bench_add_new_saving(ctx, rng):
+    user_id = ctx.user(rng)
+
+    def call():
+        ctx.savings_ids.append((user_id, ctx.db.add_new_saving(user_id, round(rng.uniform(100, 2000), 2), "benchmark")))
+    return call
+
+
+def bench_edit_saving(ctx, rng):
+    ensure_savings_ids(ctx, rng)
+    user_id, savings_id = rng.choice(ctx.savings_ids)
+    return lambda: ctx.db.edit_saving(user_id, savings_id, round(rng.uniform(100, 2000), 2), "benchmark edit")
+
+
+def bench_delete_saving(ctx, rng):
+    ensure_savings_ids(ctx, rng)
+    user_id, savings_id = ctx.savings_ids.pop()
+    return lambda: ctx.db.delete_saving(user_id, savings_id)
+
+
+def bench_edit_expense(ctx, rng):
+    ensure_expense_ids(ctx, rng)
+    user_id, expense_id = rng.choice(ctx.expense_ids)
+    return lambda: ctx.db.edit_expense(user_id, expense_id, round(rng.uniform(10, 500), 2), "benchmark")
+
+
+def bench_delete_expense(ctx, rng):
+    ensure_expense_ids(ctx, rng)
+    user_id, expense_id = ctx.expense_ids.pop()
+    return lambda: ctx.db.delete_expense(user_id, expense_id)
+
+
+def bench_create_group(ctx, rng):
+    user_id = ctx.user(rng)
+
+    def call():
+        ctx.groups.append((user_id, ctx.db.create_group(user_id, "Benchmark group", "benchmark", 10000)[0]))
+    return call
+
+
+def bench_edit_group(ctx, rng):
+    ensure_groups(ctx, rng)
+    user_id, group_id = rng.choice(ctx.groups)
+    return lambda: ctx.db.edit_group(user_id, group_id, "Benchmark group", "benchmark edit", round(rng.uniform(5000, 20000), 2))
+
+
+def bench_delete_group(ctx, rng):
+    ensure_groups(ctx, rng)
+    user_id, group_id = ctx.groups.pop()
+    return lambda: ctx.db.delete_group(user_id, group_id)
+
+
+def bench_add_user_to_challenge(ctx, rng):
+    user_id = ctx.user(rng)
+    available = ctx.db.get_challenges_user_not_member_of(user_id, limit=1)
+    challenge_id = available[0][0] if available else None
+
+    def call():
+        if challenge_id is not None:
+            ctx.db.add_user_to_challenge(user_id, challenge_id)
+            ctx.challenge_memberships.append((user_id, challenge_id))
+    return call
+
+
+def bench_add_user_to_group(ctx, rng):
+    user_id = ctx.user(rng)
+    available = ctx.db.get_groups_user_not_member_of(user_id, limit=1)
+    group_id = available[0][0] if available else None
+
+    def call():
+        if group_id is not None:
+            ctx.db.add_user_to_group(user_id, group_id)
+    return call
+
+
+def bench_create_user(ctx, rng):
+    # Emails are unique, so every call signs up a fresh address
+    email = f"benchmark-{time.time_ns()}-{rng.getrandbits(32):08x}@example.com"
+    return lambda: ctx.db.create_user("Bench", "Mark", email, "benchmark")
+
+
+def bench_remove_user_from_challenge(ctx, rng):
+    user_id, challenge_id = ctx.challenge_memberships.pop() if ctx.challenge_memberships else (ctx.user(rng), 0)
+    return lambda: ctx.db.remove_user_from_challenge(user_id, challenge_id)
+
+
+def read_benchmark(method_name, *arguments):
+    # arguments are callables of (ctx, rng) evaluated before the timed call
+    def prepare(ctx, rng):
+        values = [argument(ctx, rng) for argument in arguments]
+        method = getattr(ctx.db, method_name)
+        return lambda: method(*values)
+    return prepare
+
+
+def user_argument(ctx, rng):
+    return ctx.user(rng)
+
+
+def group_argument(ctx, rng):
+    return ctx.group(rng)
+
+
+def leaderboard_offset(ctx, rng):
+    return rng.randrange(0, max(1, ctx.counts["Users"] - 100))
+
+
+def search_argument(ctx, rng):
+    # Short prefixes match many rows, the expensive case for ranked search
+    return rng.choice(SEARCH_PREFIXES)
+
+
+def constant(value):
+    return lambda ctx, rng: value
+
+
+def bench_login_user(ctx, rng):
+    email, password = rng.choice(ctx.logins)
+    return lambda: ctx.db.login_user(email, password)
+
+
+BENCHMARKS = [
+    ("login_user", bench_login_user),
+    ("get_user_info", read_benchmark("get_user_info", user_argument)),
+    ("get_user_stats_snapshot", read_benchmark("get_user_stats_snapshot", user_argument)),
+    ("get_total_net_worth_for_user", read_benchmark("get_total_net_worth_for_user", user_argument)),
+    ("get_user_transactions", read_benchmark("get_user_transactions", user_argument, constant("date"), constant("desc"),
+                                             constant("both"), constant(200))),
+    ("get_user_savings", read_benchmark("get_user_savings", user_argument)),
+    ("get_user_expenses", read_benchmark("get_user_expenses", user_argument)),
+    ("get_savings_expenses_over_time", read_benchmark("get_savings_expenses_over_time", user_argument)),
+    ("get_savings_expenses_series", read_benchmark("get_savings_expenses_series", user_argument, constant("week"),
+                                                   constant(True))),
+    ("get_savings_expenses_span", read_benchmark("get_savings_expenses_span", user_argument)),
+    ("get_savings_expenses_downsampled", read_benchmark("get_savings_expenses_downsampled", user_argument, constant(200))),
+    ("get_total_savings", read_benchmark("get_total_savings", user_argument)),
+    ("get_total_expenses", read_benchmark("get_total_expenses", user_argument)),
+    ("get_user_net_savings", read_benchmark("get_user_net_savings", user_argument)),
+    ("get_highest_and_lowest_savings", read_benchmark("get_highest_and_lowest_savings", user_argument)),
+    ("get_highest_and_lowest_expenses", read_benchmark("get_highest_and_lowest_expenses", user_argument)),
+    ("get_number_of_savings_entries", read_benchmark("get_number_of_savings_entries", user_argument)),
+    ("get_number_of_expenses_entries", read_benchmark("get_number_of_expenses_entries", user_argument)),
+    ("get_savings_leaderboard_data", read_benchmark("get_savings_leaderboard_data", constant(100), leaderboard_offset)),
+    ("get_expense_leaderboard_data", read_benchmark("get_expense_leaderboard_data", constant(100), leaderboard_offset)),
+    ("get_net_worth_leaderboard_data", read_benchmark("get_net_worth_leaderboard_data", constant(100), leaderboard_offset)),
+    ("get_user_rank", read_benchmark("get_user_rank", user_argument)),
+    ("get_total_number_of_users", read_benchmark("get_total_number_of_users")),
+    ("get_user_challenges", read_benchmark("get_user_challenges", user_argument)),
+    ("get_challenges_user_not_member_of", read_benchmark("get_challenges_user_not_member_of", user_argument, constant(100))),
+    ("get_group_goals", read_benchmark("get_group_goals", user_argument)),
+    ("get_groups_user_not_member_of", read_benchmark("get_groups_user_not_member_of", user_argument, constant(100))),
+    ("get_group_name", read_benchmark("get_group_name", group_argument)),
+    ("search_groups", read_benchmark("search_groups", user_argument, search_argument)),
+    ("search_challenges", read_benchmark("search_challenges", user_argument, search_argument)),
+    ("add_new_saving", bench_add_new_saving),
+    ("edit_saving", bench_edit_saving),
+    ("delete_saving", bench_delete_saving),
+    ("add_new_expense", bench_add_new_expense),
+    ("edit_expense", bench_edit_expense),
+    ("delete_expense", bench_delete_expense),
+    ("create_group", bench_create_group),
+    ("edit_group", bench_edit_group),
+    ("delete_group", bench_delete_group),
+    ("add_contribution_to_group", read_benchmark("add_contribution_to_group", user_argument, group_argument, constant(25))),
+    ("get_group_contributions", read_benchmark("get_group_contributions", group_argument)),
+    ("get_group_member_contributions", read_benchmark("get_group_member_contributions", group_argument)),
+    ("compact_group_contributions", read_benchmark("compact_group_contributions")),
+    ("add_user_to_group", bench_add_user_to_group),
+    ("add_user_to_challenge", bench_add_user_to_challenge),
+    ("remove_user_from_challenge", bench_remove_user_from_challenge),
+    ("create_user", bench_create_user),
+]
+
+
+def unbenchmarked_methods():
+    # Public Database methods missing from BENCHMARKS, so new queries don't go unmeasured
+    covered = {name for name, _ in BENCHMARKS} | NOT_BENCHMARKED
+    return sorted(name for name, value in vars(Database).items()
+                  if callable(value) and not name.startswith("_") and name not in covered)
+
+
+def percentile(sorted_values, p):
+    # Nearest-rank percentile
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def run_benchmark(ctx, name, prepare, iterations, warmup, seed):
+    rng = random.Random(f"{seed}:{name}")
+    latencies = []
+    for i in range(warmup + iterations):
+        call = prepare(ctx, rng)
+        started = time.perf_counter()
+        call()
+        elapsed = time.perf_counter() - started
+        if i >= warmup:
+            latencies.append(elapsed)
+    latencies.sort()
+    return {
+        "method": name,
+        "iterations": iterations,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+        "throughput_ops_per_s": round(len(latencies) / sum(latencies), 1),
+    }
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every Database query method against a seeded Postgres.")
+    parser.add_argument("--dbname", default="savesphere_bench", help="database that is wiped and reseeded per scale")
+    parser.add_argument("--user", default="postgres")
+    parser.add_argument("--password", default=os.environ.get("PGPASSWORD", ""))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--scales", default="1k,100k,10M", help=f"comma separated, from {', '.join(SCALES)}")
+    parser.add_argument("--profile", choices=generate_mock_data.WORKLOAD_PROFILES, default="skewed")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="mock data generator processes")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", default="412")
+    parser.add_argument("--methods", help="comma separated subset of methods to run")
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the data already in --dbname (single scale)")
+    parser.add_argument("--force", action="store_true", help="wipe --dbname even if its name doesn't contain 'bench'")
+    parser.add_argument("--output", help="append JSON lines here instead of printing them")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    selected = set(args.methods.split(",")) if args.methods else None
+    missing = unbenchmarked_methods()
+    if missing:
+        print(f"No benchmark for: {', '.join(missing)}", file=sys.stderr)
+    benchmarks = [(name, prepare) for name, prepare in BENCHMARKS if selected is None or name in selected]
+    commit = current_commit()
+    output = open(args.output, "a") if args.output else sys.stdout
+
+    # The cache is disabled so every call measures the database round trip
+    db = Database(args.dbname, args.user, args.password, args.host, cache_size=0)
+    try:
+        for scale in args.scales.split(","):
+            counts = scale_counts(SCALES[scale])
+            if not args.skip_seed:
+                started = time.perf_counter()
+                reset_database(db, args.force)
+                seed_database(db, args, counts)
+                print(f"Seeded {scale} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+            ctx = BenchmarkContext(db, counts)
+            for name, prepare in benchmarks:
+                result = run_benchmark(ctx, name, prepare, args.iterations, args.warmup, args.seed)
+                result.update(commit=commit, scale=scale, transactions=SCALES[scale], profile=args.profile)
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+    finally:
+        db.close()
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
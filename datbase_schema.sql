@@ -59,4 +59,7 @@ CREATE TABLE UserChallenges (
   PRIMARY KEY (UserID, ChallengeID),
   FOREIGN KEY (UserID) REFERENCES Users(UserID) ON DELETE CASCADE,
   FOREIGN KEY (ChallengeID) REFERENCES Challenges(ChallengeID) ON DELETE CASCADE
-);
\ No newline at end of file
+);
+
+-- Running totals, indexes and later schema changes live in migrations/ and are
+-- applied in order by Database.apply_migrations() when the app starts.
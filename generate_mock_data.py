@@ -1,111 +1,356 @@
 from faker import Faker
+import argparse
+import bisect
+import csv
+import io
+import math
+import os
 import random
-from datetime import datetime
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from itertools import accumulate, islice
 
-fake = Faker()
+WORKLOAD_PROFILES = ('uniform', 'skewed')
+# Fixed rather than today's date, so the same seed generates the same rows on any day
+DEFAULT_END_DATE = date(2026, 1, 1)
 
-def generate_users(n):
+_zipf_cum_weights = {}
+
+class WorkloadProfile:
+    # Decides who is active and when. 'uniform' spreads activity evenly over users,
+    # 'skewed' draws them from a Zipf distribution so a few hot users own most rows.
+    # Everything is a pure function of the seed, so every worker process agrees on
+    # join dates and group owners without sharing state.
+    def __init__(self, user_count, name='uniform', exponent=1.1, seed='412', end_date=DEFAULT_END_DATE, history_days=5 * 365):
+        self.user_count = user_count
+        self.exponent = exponent if name == 'skewed' else 0.0
+        self.seed = zlib.crc32(str(seed).encode())
+        self.end_date = end_date
+        self.history_days = history_days
+        # Zipf ranks are spread over ids with a stride coprime to user_count, so the
+        # hottest users are not simply the first ones inserted.
+        self.stride = self.seed % user_count if user_count > 1 else 1
+        while self.stride == 0 or math.gcd(self.stride, user_count) != 1:
+            self.stride += 1
+        self.offset = self.seed % user_count if user_count else 0
+
+    def cum_weights(self):
+        key = (self.user_count, self.exponent)
+        if key not in _zipf_cum_weights:
+            _zipf_cum_weights[key] = list(accumulate(rank ** -self.exponent for rank in range(1, self.user_count + 1)))
+        return _zipf_cum_weights[key]
+
+    def pick_user(self, rng):
+        if not self.exponent:
+            return rng.randint(1, self.user_count)
+        weights = self.cum_weights()
+        rank = min(bisect.bisect(weights, rng.random() * weights[-1]), self.user_count - 1)
+        return (rank * self.stride + self.offset) % self.user_count + 1
+
+    def pick_users(self, rng, k, include=None):
+        # k distinct user ids, always containing include when given
+        target = min(k, self.user_count)
+        members = {include} if include else set()
+        if self.exponent and target <= self.user_count // 2:
+            while len(members) < target:
+                members.add(self.pick_user(rng))
+        else:
+            for user_id in rng.sample(range(1, self.user_count + 1), target):
+                if len(members) >= target:
+                    break
+                members.add(user_id)
+        return sorted(members)
+
+    def join_date(self, user_id):
+        # Squaring the hash fraction favours recent sign-ups, like a growing user base
+        fraction = (((user_id * 2654435761) ^ self.seed) & 0xFFFFFFFF) / 2 ** 32
+        return self.end_date - timedelta(days=int(self.history_days * fraction ** 2))
+
+    def group_owner(self, group_id):
+        return self.pick_user(random.Random(self.seed * 1_000_003 + group_id))
+
+    def activity_date(self, rng, user_id, payday=False, weekend=False):
+        joined = self.join_date(user_id)
+        day = joined + timedelta(days=rng.randint(0, (self.end_date - joined).days))
+        if payday and rng.random() < 0.5:
+            payday_date = day.replace(day=15 if day.day >= 15 else 1)
+            if payday_date >= joined:
+                day = payday_date
+        if weekend and rng.random() < 0.3:
+            saturday = day + timedelta(days=(5 - day.weekday()) % 7)
+            if saturday <= self.end_date:
+                day = saturday
+        return day.strftime('%Y-%m-%d')
+
+def membership_size(total, parents, index):
+    # Splits total join rows as evenly as possible over the parent rows
+    return total // parents + (1 if index < total % parents else 0)
+
+def generate_users(n, start, counts, profile, fake, rng):
     users = []
-    for _ in range(n):
+    for i in range(n):
+        user_id = start + i + 1
         first_name = fake.first_name()
         last_name = fake.last_name()
-        email = first_name+last_name+"@gmail.com"
+        email = first_name+last_name+str(user_id)+"@gmail.com"
         password = fake.password()
-        date_joined = fake.date_between(start_date='-5y', end_date='today').strftime('%Y-%m-%d')
+        date_joined = profile.join_date(user_id).strftime('%Y-%m-%d')
         users.append((first_name, last_name, email, password, date_joined))
     return users
 
-def generate_groups(n,user_count):
+def generate_groups(n, start, counts, profile, fake, rng):
     groups = []
-    for _ in range(n):
+    for i in range(n):
         group_name = fake.company()
         description = fake.catch_phrase()
-        group_goal = round(random.uniform(5000, 20000), 2)
-        current_group_savings = round(random.uniform(1000, group_goal), 2)
-        owner_id = random.randint(1, user_count)
+        group_goal = round(rng.uniform(5000, 20000), 2)
+        current_group_savings = round(rng.uniform(1000, group_goal), 2)
+        owner_id = profile.group_owner(start + i + 1)
         groups.append((group_name, description, group_goal, current_group_savings, owner_id))
     return groups
 
-def generate_expenses(n, user_count):
+def generate_expenses(n, start, counts, profile, fake, rng):
     expenses = []
     for _ in range(n):
-        user_id = random.randint(1, user_count)
-        amount = round(random.uniform(10, 500), 2)
+        user_id = profile.pick_user(rng)
+        amount = round(rng.uniform(10, 500), 2)
         category = fake.word()
-        date = fake.date_between(start_date='-2y', end_date='today').strftime('%Y-%m-%d')
+        date = profile.activity_date(rng, user_id, weekend=True)
         expenses.append((user_id, amount, category, date))
     return expenses
 
-def generate_savings(n, user_count):
+def generate_savings(n, start, counts, profile, fake, rng):
     savings = []
     for _ in range(n):
-        user_id = random.randint(1, user_count)
-        amount = round(random.uniform(100, 2000), 2)
+        user_id = profile.pick_user(rng)
+        amount = round(rng.uniform(100, 2000), 2)
         purpose = fake.sentence(nb_words=4)
-        date = fake.date_between(start_date='-2y', end_date='today').strftime('%Y-%m-%d')
+        date = profile.activity_date(rng, user_id, payday=True)
         savings.append((user_id, amount, purpose, date))
     return savings
 
-def generate_challenges(n):
+def generate_challenges(n, start, counts, profile, fake, rng):
     challenges = []
     for _ in range(n):
         name = fake.sentence(nb_words=3)
         brief_description = fake.sentence(nb_words=6)
         description = fake.text()
-        start_date_str = fake.date_between(start_date='-2y', end_date='today').strftime('%Y-%m-%d')
-        start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()  # Convert to date object
-        end_date = fake.date_between(start_date=start_date, end_date='+1y').strftime('%Y-%m-%d')
-        target_amount = round(random.uniform(500, 5000), 2)
-        challenges.append((name, brief_description, description, start_date_str, end_date, target_amount))
+        start_date = profile.end_date - timedelta(days=rng.randint(0, 2 * 365))
+        end_date = start_date + timedelta(days=rng.randint(7, 365))
+        target_amount = round(rng.uniform(500, 5000), 2)
+        challenges.append((name, brief_description, description, start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'), target_amount))
     return challenges
 
-def generate_user_groups(n, user_count, group_count):
+# Join tables are generated per parent row (n groups/challenges from start), drawing a
+# distinct member set for each one, so (UserID, parent) pairs are unique by construction.
+def generate_user_groups(n, start, counts, profile, fake, rng):
     user_groups = []
-    for _ in range(n):
-        user_id = random.randint(1, user_count)
-        group_id = random.randint(1, group_count)
-        user_groups.append((user_id, group_id))
+    for i in range(n):
+        group_id = start + i + 1
+        size = membership_size(counts['UserGroups'], counts['Groups'], start + i)
+        for user_id in profile.pick_users(rng, size, include=profile.group_owner(group_id)):
+            user_groups.append((user_id, group_id))
     return user_groups
 
-def generate_user_challenges(n, user_count, challenge_count):
+def generate_user_challenges(n, start, counts, profile, fake, rng):
     user_challenges = []
-    for _ in range(n):
-        user_id = random.randint(1, user_count)
-        challenge_id = random.randint(1, challenge_count)
-        user_challenges.append((user_id, challenge_id))
+    for i in range(n):
+        challenge_id = start + i + 1
+        size = membership_size(counts['UserChallenges'], counts['Challenges'], start + i)
+        for user_id in profile.pick_users(rng, size):
+            user_challenges.append((user_id, challenge_id))
     return user_challenges
 
+TABLE_GENERATORS = {
+    'Users': generate_users,
+    'Groups': generate_groups,
+    'Expenses': generate_expenses,
+    'Savings': generate_savings,
+    'Challenges': generate_challenges,
+    'UserGroups': generate_user_groups,
+    'UserChallenges': generate_user_challenges,
+}
+
+# Join tables are chunked by their parent table rather than by row
+TABLE_UNITS = {
+    'UserGroups': 'Groups',
+    'UserChallenges': 'Challenges',
+}
+
+_worker_fake = None
+
+def generate_chunk(table_name, chunk_index, start, n, counts, profile, seed):
+    # Every chunk gets its own seed derived from (seed, table, chunk), so output is
+    # identical no matter how many workers run or which one picks the chunk up.
+    global _worker_fake
+    if _worker_fake is None:
+        _worker_fake = Faker()
+    chunk_seed = f"{seed}:{table_name}:{chunk_index}"
+    _worker_fake.seed_instance(chunk_seed)
+    return TABLE_GENERATORS[table_name](n, start, counts, profile, _worker_fake, random.Random(chunk_seed))
+
+def generate_table_stream(executor, table_name, counts, profile, seed, chunk_size, max_in_flight):
+    # Yields the table's rows in order while keeping at most max_in_flight chunks
+    # queued or held in memory.
+    if not counts['Users'] and table_name != 'Challenges':
+        return
+    units = TABLE_UNITS.get(table_name)
+    total = counts[units] if units else counts[table_name]
+    if units:
+        if not counts[table_name]:
+            return
+        chunk_size = max(1, chunk_size * total // counts[table_name])
+    pending = deque()
+    for chunk_index, start in enumerate(range(0, total, chunk_size)):
+        n = min(chunk_size, total - start)
+        if executor is None:
+            yield from generate_chunk(table_name, chunk_index, start, n, counts, profile, seed)
+            continue
+        pending.append(executor.submit(generate_chunk, table_name, chunk_index, start, n, counts, profile, seed))
+        if len(pending) >= max_in_flight:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
 def save_to_file(filename, data, table_name, columns):
     with open(filename, 'a') as file:
         for record in data:
-            values = ', '.join([f"'{str(v)}'" for v in record])  # Treat all values as strings
+            values = ', '.join(["'" + str(v).replace("'", "''") + "'" for v in record])  # Treat all values as strings
             query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({values});\n"
             file.write(query)
 
-def main():
-    n_users = int(input("Enter the number of Users to generate: "))
-    n_groups = int(input("Enter the number of Groups to generate: "))
-    n_expenses = int(input("Enter the number of Expenses to generate: "))
-    n_savings = int(input("Enter the number of Savings to generate: "))
-    n_challenges = int(input("Enter the number of Challenges to generate: "))
-    n_user_groups = int(input("Enter the number of User-Group relations to generate: "))
-    n_user_challenges = int(input("Enter the number of User-Challenge relations to generate: "))
-
-    users = generate_users(n_users)
-    groups = generate_groups(n_groups, n_users)
-    expenses = generate_expenses(n_expenses, n_users)
-    savings = generate_savings(n_savings, n_users)
-    challenges = generate_challenges(n_challenges)
-    user_groups = generate_user_groups(n_user_groups, n_users, n_groups)
-    user_challenges = generate_user_challenges(n_user_challenges, n_users, n_challenges)
-
-    save_to_file('mock_data.sql', users, 'Users', ['FirstName', 'LastName', 'Email', 'Password', 'DateJoined'])
-    save_to_file('mock_data.sql', groups, 'Groups', ['GroupName', 'Description', 'GroupGoal', 'CurrentGroupSavings', 'OwnerID'])
-    save_to_file('mock_data.sql', expenses, 'Expenses', ['UserID', 'Amount', 'Category', 'Date'])
-    save_to_file('mock_data.sql', savings, 'Savings', ['UserID', 'Amount', 'Purpose', 'Date'])
-    save_to_file('mock_data.sql', challenges, 'Challenges', ['Name', 'BriefDescription', 'Description', 'StartDate', 'EndDate', 'TargetAmount'])
-    save_to_file('mock_data.sql', user_groups, 'UserGroups', ['UserID', 'GroupID'])
-    save_to_file('mock_data.sql', user_challenges, 'UserChallenges', ['UserID', 'ChallengeID'])
+# Load order matters: later tables reference ids assigned to earlier ones.
+TABLE_COLUMNS = {
+    'Users': ['FirstName', 'LastName', 'Email', 'Password', 'DateJoined'],
+    'Groups': ['GroupName', 'Description', 'GroupGoal', 'CurrentGroupSavings', 'OwnerID'],
+    'Expenses': ['UserID', 'Amount', 'Category', 'Date'],
+    'Savings': ['UserID', 'Amount', 'Purpose', 'Date'],
+    'Challenges': ['Name', 'BriefDescription', 'Description', 'StartDate', 'EndDate', 'TargetAmount'],
+    'UserGroups': ['UserID', 'GroupID'],
+    'UserChallenges': ['UserID', 'ChallengeID'],
+}
+
+# Per-row UserTotals and GroupMemberCounts triggers are switched off while loading; both are
+# rebuilt in one pass afterwards.
+BULK_LOAD_TRIGGERS = {
+    'Users': 'user_totals_user_insert',
+    'Expenses': 'user_totals_expenses_change',
+    'Savings': 'user_totals_savings_change',
+    'UserGroups': 'group_member_count_change',
+}
+
+class CopyStream:
+    # File-like object that renders rows as CSV on demand for cursor.copy_expert,
+    # so a table is streamed to the server without building the whole payload first.
+    def __init__(self, rows, batch_rows=1000):
+        self.rows = iter(rows)
+        self.batch_rows = batch_rows
+        self.buffer = ''
+        self.text = io.StringIO()
+        self.writer = csv.writer(self.text, lineterminator='\n')
+
+    def read(self, size=-1):
+        while (size < 0 or len(self.buffer) < size) and self.fill():
+            pass
+        if size < 0:
+            size = len(self.buffer)
+        chunk, self.buffer = self.buffer[:size], self.buffer[size:]
+        return chunk
+
+    readline = read
+
+    def fill(self):
+        batch = list(islice(self.rows, self.batch_rows))
+        if not batch:
+            return False
+        self.text.seek(0)
+        self.text.truncate()
+        self.writer.writerows(batch)
+        self.buffer += self.text.getvalue()
+        return True
+
+def copy_table(connection, table_name, columns, rows):
+    # One transaction per table: the rows either all land or none do.
+    trigger = BULK_LOAD_TRIGGERS.get(table_name)
+    with connection:
+        with connection.cursor() as cursor:
+            if trigger:
+                cursor.execute(f"ALTER TABLE {table_name} DISABLE TRIGGER {trigger}")
+            cursor.copy_expert(f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", CopyStream(rows))
+            if trigger:
+                cursor.execute(f"ALTER TABLE {table_name} ENABLE TRIGGER {trigger}")
+
+def load_to_database(dsn, tables, progress=None):
+    # The bulk-load triggers and rebuild functions come from the migrations, so any that
+    # are missing are applied first. progress(table_name) is called after each table.
+    import psycopg2
+    from Project import run_migrations
+
+    connection = psycopg2.connect(dsn)
+    try:
+        run_migrations(connection)
+        for table_name, rows in tables:
+            copy_table(connection, table_name, TABLE_COLUMNS[table_name], rows)
+            if progress is not None:
+                progress(table_name)
+        with connection:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT rebuild_user_totals()")
+                cursor.execute("SELECT rebuild_group_member_counts()")
+    finally:
+        connection.close()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate mock data for the savings app.")
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--groups', type=int, default=300)
+    parser.add_argument('--expenses', type=int, default=4000)
+    parser.add_argument('--savings', type=int, default=7000)
+    parser.add_argument('--challenges', type=int, default=200)
+    parser.add_argument('--user-groups', type=int, default=500)
+    parser.add_argument('--user-challenges', type=int, default=500)
+    parser.add_argument('--profile', choices=WORKLOAD_PROFILES, default='uniform',
+                        help="'skewed' gives a few hot users most of the transactions and memberships")
+    parser.add_argument('--zipf-exponent', type=float, default=1.1, help="skew of the 'skewed' profile")
+    parser.add_argument('--end-date', type=date.fromisoformat, default=DEFAULT_END_DATE, help="latest generated date (YYYY-MM-DD)")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="rows generated per task")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="generator processes; 1 runs inline")
+    parser.add_argument('--seed', default='412', help="same seed and counts give the same data")
+    parser.add_argument('--output', default='mock_data.sql', help="file the INSERT statements are appended to")
+    parser.add_argument('--load', nargs='?', const=os.environ.get('DATABASE_URL', ''), metavar='DSN',
+                        help="COPY straight into Postgres instead of writing --output (defaults to $DATABASE_URL)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    counts = {
+        'Users': args.users,
+        'Groups': args.groups,
+        'Expenses': args.expenses,
+        'Savings': args.savings,
+        'Challenges': args.challenges,
+        'UserGroups': args.user_groups,
+        'UserChallenges': args.user_challenges,
+    }
+
+    profile = WorkloadProfile(counts['Users'], args.profile, args.zipf_exponent, args.seed, args.end_date)
+
+    executor = ProcessPoolExecutor(args.workers) if args.workers > 1 else None
+    try:
+        tables = [
+            (table_name, generate_table_stream(executor, table_name, counts, profile, args.seed, args.chunk_size, args.workers * 2))
+            for table_name in TABLE_COLUMNS
+        ]
+        if args.load is not None:
+            load_to_database(args.load, tables, progress=lambda table_name: print(f"Loaded {table_name}"))
+        else:
+            for table_name, rows in tables:
+                save_to_file(args.output, rows, table_name, TABLE_COLUMNS[table_name])
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,67 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+# Cold-start budget for `import Project`, measured with `python -X importtime`
+DEFAULT_BUDGET_MS = 250
+# Modules that must stay out of startup; they load on first use
+DEFERRED_MODULES = ("matplotlib", "psycopg2")
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)")
+
+
+def measure_import(module):
+    # Returns (cumulative ms for module, names of every module imported with it)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+    cumulative_us = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(3)
+        imported.add(name)
+        if name == module:
+            cumulative_us = int(match.group(2))
+    if cumulative_us is None:
+        raise RuntimeError(f"{module} missing from -X importtime output (already imported?)")
+    return cumulative_us / 1000, imported
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fail when importing Project.py gets slower than the cold-start budget.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3, help="best of this many fresh interpreters is compared")
+    parser.add_argument("--module", default="Project")
+    args = parser.parse_args(argv)
+
+    timings = []
+    imported = set()
+    for _ in range(args.runs):
+        elapsed_ms, imported = measure_import(args.module)
+        timings.append(elapsed_ms)
+    best = min(timings)
+
+    failures = []
+    if best > args.budget_ms:
+        failures.append(f"import {args.module} took {best:.1f} ms, budget is {args.budget_ms:.0f} ms")
+    for name in DEFERRED_MODULES:
+        if name in imported:
+            failures.append(f"{name} is imported at startup; it should load on first use")
+
+    print(f"import {args.module}: best {best:.1f} ms of {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
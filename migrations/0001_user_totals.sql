@@ -0,0 +1,116 @@
+-- Per-user running totals, kept current by the triggers below so leaderboards
+-- and dashboards read one row per user instead of aggregating every transaction.
+CREATE TABLE IF NOT EXISTS UserTotals (
+  UserID INT PRIMARY KEY,
+  SavingsTotal DECIMAL(14, 2) NOT NULL DEFAULT 0,
+  SavingsCount INT NOT NULL DEFAULT 0,
+  SavingsMax DECIMAL(10, 2),
+  SavingsMin DECIMAL(10, 2),
+  ExpensesTotal DECIMAL(14, 2) NOT NULL DEFAULT 0,
+  ExpensesCount INT NOT NULL DEFAULT 0,
+  ExpensesMax DECIMAL(10, 2),
+  ExpensesMin DECIMAL(10, 2),
+  NetWorth DECIMAL(14, 2) GENERATED ALWAYS AS (SavingsTotal - ExpensesTotal) STORED,
+  FOREIGN KEY (UserID) REFERENCES Users(UserID) ON DELETE CASCADE
+);
+
+CREATE OR REPLACE FUNCTION user_totals_on_user_insert() RETURNS TRIGGER AS $$
+BEGIN
+  INSERT INTO UserTotals (UserID) VALUES (NEW.UserID) ON CONFLICT (UserID) DO NOTHING;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS user_totals_user_insert ON Users;
+CREATE TRIGGER user_totals_user_insert
+AFTER INSERT ON Users
+FOR EACH ROW EXECUTE FUNCTION user_totals_on_user_insert();
+
+-- Removing a row only forces a MIN/MAX recount when it held one of the extremes.
+CREATE OR REPLACE FUNCTION user_totals_on_savings_change() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.UserID IS NOT NULL THEN
+    UPDATE UserTotals
+    SET SavingsTotal = SavingsTotal - OLD.Amount, SavingsCount = SavingsCount - 1
+    WHERE UserID = OLD.UserID;
+
+    UPDATE UserTotals ut
+    SET SavingsMax = x.MaxAmount, SavingsMin = x.MinAmount
+    FROM (SELECT MAX(Amount) AS MaxAmount, MIN(Amount) AS MinAmount FROM Savings WHERE UserID = OLD.UserID) x
+    WHERE ut.UserID = OLD.UserID AND (OLD.Amount >= ut.SavingsMax OR OLD.Amount <= ut.SavingsMin);
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.UserID IS NOT NULL THEN
+    INSERT INTO UserTotals (UserID, SavingsTotal, SavingsCount, SavingsMax, SavingsMin)
+    VALUES (NEW.UserID, NEW.Amount, 1, NEW.Amount, NEW.Amount)
+    ON CONFLICT (UserID) DO UPDATE
+    SET SavingsTotal = UserTotals.SavingsTotal + EXCLUDED.SavingsTotal,
+        SavingsCount = UserTotals.SavingsCount + 1,
+        SavingsMax = GREATEST(UserTotals.SavingsMax, EXCLUDED.SavingsMax),
+        SavingsMin = LEAST(UserTotals.SavingsMin, EXCLUDED.SavingsMin);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS user_totals_savings_change ON Savings;
+CREATE TRIGGER user_totals_savings_change
+AFTER INSERT OR UPDATE OF UserID, Amount OR DELETE ON Savings
+FOR EACH ROW EXECUTE FUNCTION user_totals_on_savings_change();
+
+CREATE OR REPLACE FUNCTION user_totals_on_expenses_change() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.UserID IS NOT NULL THEN
+    UPDATE UserTotals
+    SET ExpensesTotal = ExpensesTotal - OLD.Amount, ExpensesCount = ExpensesCount - 1
+    WHERE UserID = OLD.UserID;
+
+    UPDATE UserTotals ut
+    SET ExpensesMax = x.MaxAmount, ExpensesMin = x.MinAmount
+    FROM (SELECT MAX(Amount) AS MaxAmount, MIN(Amount) AS MinAmount FROM Expenses WHERE UserID = OLD.UserID) x
+    WHERE ut.UserID = OLD.UserID AND (OLD.Amount >= ut.ExpensesMax OR OLD.Amount <= ut.ExpensesMin);
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.UserID IS NOT NULL THEN
+    INSERT INTO UserTotals (UserID, ExpensesTotal, ExpensesCount, ExpensesMax, ExpensesMin)
+    VALUES (NEW.UserID, NEW.Amount, 1, NEW.Amount, NEW.Amount)
+    ON CONFLICT (UserID) DO UPDATE
+    SET ExpensesTotal = UserTotals.ExpensesTotal + EXCLUDED.ExpensesTotal,
+        ExpensesCount = UserTotals.ExpensesCount + 1,
+        ExpensesMax = GREATEST(UserTotals.ExpensesMax, EXCLUDED.ExpensesMax),
+        ExpensesMin = LEAST(UserTotals.ExpensesMin, EXCLUDED.ExpensesMin);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS user_totals_expenses_change ON Expenses;
+CREATE TRIGGER user_totals_expenses_change
+AFTER INSERT OR UPDATE OF UserID, Amount OR DELETE ON Expenses
+FOR EACH ROW EXECUTE FUNCTION user_totals_on_expenses_change();
+
+-- Recomputes every user's totals from scratch, e.g. after bulk loads into an
+-- existing database or to repair drift.
+CREATE OR REPLACE FUNCTION rebuild_user_totals() RETURNS VOID AS $$
+BEGIN
+  LOCK TABLE Savings, Expenses IN SHARE MODE;
+  DELETE FROM UserTotals;
+  INSERT INTO UserTotals (UserID, SavingsTotal, SavingsCount, SavingsMax, SavingsMin,
+                          ExpensesTotal, ExpensesCount, ExpensesMax, ExpensesMin)
+  SELECT u.UserID,
+         COALESCE(s.Total, 0), COALESCE(s.Entries, 0), s.MaxAmount, s.MinAmount,
+         COALESCE(e.Total, 0), COALESCE(e.Entries, 0), e.MaxAmount, e.MinAmount
+  FROM Users u
+  LEFT JOIN (
+    SELECT UserID, SUM(Amount) AS Total, COUNT(*) AS Entries, MAX(Amount) AS MaxAmount, MIN(Amount) AS MinAmount
+    FROM Savings GROUP BY UserID
+  ) s ON s.UserID = u.UserID
+  LEFT JOIN (
+    SELECT UserID, SUM(Amount) AS Total, COUNT(*) AS Entries, MAX(Amount) AS MaxAmount, MIN(Amount) AS MinAmount
+    FROM Expenses GROUP BY UserID
+  ) e ON e.UserID = u.UserID;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill totals for rows that existed before the triggers did.
+SELECT rebuild_user_totals();
@@ -0,0 +1,4 @@
+-- Leaderboards read UserTotals in rank order; UserID breaks ties so pages are stable.
+CREATE INDEX IF NOT EXISTS idx_usertotals_savings_rank ON UserTotals (SavingsTotal DESC, UserID);
+CREATE INDEX IF NOT EXISTS idx_usertotals_expenses_rank ON UserTotals (ExpensesTotal DESC, UserID);
+CREATE INDEX IF NOT EXISTS idx_usertotals_networth_rank ON UserTotals (NetWorth DESC, UserID);
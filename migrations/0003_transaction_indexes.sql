@@ -0,0 +1,12 @@
+-- Per-user transaction views filter on UserID and order by Date or Amount.
+-- Including Amount lets date-ordered sums be answered from the index alone,
+-- and (UserID, Amount) also serves the MIN/MAX recounts in the totals triggers.
+CREATE INDEX IF NOT EXISTS idx_savings_user_date ON Savings (UserID, Date) INCLUDE (Amount);
+CREATE INDEX IF NOT EXISTS idx_savings_user_amount ON Savings (UserID, Amount);
+CREATE INDEX IF NOT EXISTS idx_expenses_user_date ON Expenses (UserID, Date) INCLUDE (Amount);
+CREATE INDEX IF NOT EXISTS idx_expenses_user_amount ON Expenses (UserID, Amount);
+
+-- The join tables' primary keys lead with UserID; group and challenge listings
+-- probe them by the second column.
+CREATE INDEX IF NOT EXISTS idx_usergroups_group ON UserGroups (GroupID, UserID);
+CREATE INDEX IF NOT EXISTS idx_userchallenges_challenge ON UserChallenges (ChallengeID, UserID);
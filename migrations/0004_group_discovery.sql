@@ -0,0 +1,41 @@
+-- Member counts for group discovery, kept current by the trigger below so browsing
+-- groups reads one row per group instead of counting UserGroups for every page.
+ALTER TABLE Groups ADD COLUMN IF NOT EXISTS MemberCount INT NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION group_member_count_on_change() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    UPDATE Groups SET MemberCount = MemberCount - 1 WHERE GroupID = OLD.GroupID;
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    UPDATE Groups SET MemberCount = MemberCount + 1 WHERE GroupID = NEW.GroupID;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS group_member_count_change ON UserGroups;
+CREATE TRIGGER group_member_count_change
+AFTER INSERT OR UPDATE OF GroupID OR DELETE ON UserGroups
+FOR EACH ROW EXECUTE FUNCTION group_member_count_on_change();
+
+-- Recounts every group's members, e.g. after bulk loads into UserGroups.
+CREATE OR REPLACE FUNCTION rebuild_group_member_counts() RETURNS VOID AS $$
+BEGIN
+  LOCK TABLE UserGroups IN SHARE MODE;
+  UPDATE Groups g
+  SET MemberCount = COALESCE(c.Members, 0)
+  FROM Groups g2
+  LEFT JOIN (SELECT GroupID, COUNT(*) AS Members FROM UserGroups GROUP BY GroupID) c ON c.GroupID = g2.GroupID
+  WHERE g.GroupID = g2.GroupID AND g.MemberCount <> COALESCE(c.Members, 0);
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT rebuild_group_member_counts();
+
+-- Discovery pages are ordered and keyset-paginated on (lower(name), id). The C
+-- collation lets the same index serve the ORDER BY, the row comparison that
+-- resumes after the previous page, and LIKE 'prefix%' name filters.
+CREATE INDEX IF NOT EXISTS idx_groups_name_key ON Groups (lower(GroupName) COLLATE "C", GroupID);
+CREATE INDEX IF NOT EXISTS idx_challenges_name_key ON Challenges (lower(Name) COLLATE "C", ChallengeID);
@@ -0,0 +1,16 @@
+-- Full-text search over groups and challenges. Names weigh most, then short
+-- descriptions, then long ones. The 'simple' configuration skips stemming, so
+-- search-as-you-type prefix queries (term:*) match the words as typed.
+ALTER TABLE Groups ADD COLUMN IF NOT EXISTS SearchVector tsvector GENERATED ALWAYS AS (
+  setweight(to_tsvector('simple', coalesce(GroupName, '')), 'A') ||
+  setweight(to_tsvector('simple', coalesce(Description, '')), 'B')
+) STORED;
+
+ALTER TABLE Challenges ADD COLUMN IF NOT EXISTS SearchVector tsvector GENERATED ALWAYS AS (
+  setweight(to_tsvector('simple', coalesce(Name, '')), 'A') ||
+  setweight(to_tsvector('simple', coalesce(BriefDescription, '')), 'B') ||
+  setweight(to_tsvector('simple', coalesce(Description, '')), 'C')
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_groups_search ON Groups USING GIN (SearchVector);
+CREATE INDEX IF NOT EXISTS idx_challenges_search ON Challenges USING GIN (SearchVector);
@@ -0,0 +1,53 @@
+-- Append-only ledger of group contributions. Contributing only inserts here, so
+-- concurrent contributors to one group never wait on each other's row locks.
+-- Groups.CurrentGroupSavings holds the compacted total; rows not yet folded into
+-- it are Compacted = FALSE, and a group's live total is the two added together.
+CREATE TABLE IF NOT EXISTS GroupContributions (
+  ContributionID BIGSERIAL PRIMARY KEY,
+  GroupID INT NOT NULL,
+  UserID INT,
+  Amount DECIMAL(10, 2) NOT NULL,
+  ContributedAt TIMESTAMPTZ NOT NULL DEFAULT now(),
+  Compacted BOOLEAN NOT NULL DEFAULT FALSE,
+  FOREIGN KEY (GroupID) REFERENCES Groups(GroupID) ON DELETE CASCADE,
+  FOREIGN KEY (UserID) REFERENCES Users(UserID) ON DELETE SET NULL
+);
+
+-- History pages walk a group's contributions newest first.
+CREATE INDEX IF NOT EXISTS idx_group_contributions_group ON GroupContributions (GroupID, ContributionID);
+-- Per-member totals are summed from the index alone.
+CREATE INDEX IF NOT EXISTS idx_group_contributions_member ON GroupContributions (GroupID, UserID) INCLUDE (Amount);
+-- Only the pending tail is indexed for live totals and compaction; it stays small.
+CREATE INDEX IF NOT EXISTS idx_group_contributions_pending ON GroupContributions (GroupID) INCLUDE (Amount) WHERE NOT Compacted;
+
+-- Folds up to batch_size pending contributions into Groups.CurrentGroupSavings and
+-- returns how many were folded. Flagging the rows and bumping the totals commit
+-- together, so live totals read the same before and after. One compactor runs at a
+-- time (others return 0 immediately), which keeps the Groups updates deadlock-free.
+CREATE OR REPLACE FUNCTION compact_group_contributions(batch_size INT DEFAULT 10000) RETURNS INT AS $$
+DECLARE
+  folded INT;
+BEGIN
+  IF NOT pg_try_advisory_xact_lock(412002) THEN
+    RETURN 0;
+  END IF;
+
+  WITH batch AS (
+    UPDATE GroupContributions
+    SET Compacted = TRUE
+    WHERE ContributionID IN (
+      SELECT ContributionID FROM GroupContributions WHERE NOT Compacted ORDER BY ContributionID LIMIT batch_size
+    )
+    RETURNING GroupID, Amount
+  ), totals AS (
+    SELECT GroupID, SUM(Amount) AS Total, COUNT(*) AS Entries FROM batch GROUP BY GroupID
+  ), bumped AS (
+    UPDATE Groups g
+    SET CurrentGroupSavings = g.CurrentGroupSavings + t.Total
+    FROM totals t
+    WHERE g.GroupID = t.GroupID
+  )
+  SELECT COALESCE(SUM(Entries), 0) INTO folded FROM totals;
+  RETURN folded;
+END;
+$$ LANGUAGE plpgsql;
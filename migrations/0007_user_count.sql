@@ -0,0 +1,52 @@
+-- Single-row user count, so placements and the user total read one row instead
+-- of counting every user. Kept by the Users insert/delete triggers and reset by
+-- rebuild_user_totals().
+CREATE TABLE IF NOT EXISTS UserCount (
+  Singleton BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (Singleton),
+  Total BIGINT NOT NULL DEFAULT 0
+);
+INSERT INTO UserCount (Singleton) VALUES (TRUE) ON CONFLICT (Singleton) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION user_totals_on_user_insert() RETURNS TRIGGER AS $$
+BEGIN
+  INSERT INTO UserTotals (UserID) VALUES (NEW.UserID) ON CONFLICT (UserID) DO NOTHING;
+  UPDATE UserCount SET Total = Total + 1;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION user_count_on_user_delete() RETURNS TRIGGER AS $$
+BEGIN
+  UPDATE UserCount SET Total = Total - 1;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS user_count_user_delete ON Users;
+CREATE TRIGGER user_count_user_delete
+AFTER DELETE ON Users
+FOR EACH ROW EXECUTE FUNCTION user_count_on_user_delete();
+
+CREATE OR REPLACE FUNCTION rebuild_user_totals() RETURNS VOID AS $$
+BEGIN
+  LOCK TABLE Savings, Expenses IN SHARE MODE;
+  DELETE FROM UserTotals;
+  INSERT INTO UserTotals (UserID, SavingsTotal, SavingsCount, SavingsMax, SavingsMin,
+                          ExpensesTotal, ExpensesCount, ExpensesMax, ExpensesMin)
+  SELECT u.UserID,
+         COALESCE(s.Total, 0), COALESCE(s.Entries, 0), s.MaxAmount, s.MinAmount,
+         COALESCE(e.Total, 0), COALESCE(e.Entries, 0), e.MaxAmount, e.MinAmount
+  FROM Users u
+  LEFT JOIN (
+    SELECT UserID, SUM(Amount) AS Total, COUNT(*) AS Entries, MAX(Amount) AS MaxAmount, MIN(Amount) AS MinAmount
+    FROM Savings GROUP BY UserID
+  ) s ON s.UserID = u.UserID
+  LEFT JOIN (
+    SELECT UserID, SUM(Amount) AS Total, COUNT(*) AS Entries, MAX(Amount) AS MaxAmount, MIN(Amount) AS MinAmount
+    FROM Expenses GROUP BY UserID
+  ) e ON e.UserID = u.UserID;
+  UPDATE UserCount SET Total = (SELECT COUNT(*) FROM UserTotals);
+END;
+$$ LANGUAGE plpgsql;
+
+UPDATE UserCount SET Total = (SELECT COUNT(*) FROM Users);
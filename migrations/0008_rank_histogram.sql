@@ -0,0 +1,144 @@
+-- Placement lookups in constant time. Ranks come from a histogram of users per
+-- fixed-width score bucket plus a count inside the user's own bucket, and the
+-- user total from a sharded counter. Both are split into 16 shards by UserID, so
+-- concurrent signups and totals updates don't queue on one counter row.
+
+-- Scores are bucketed in steps of 100; rank_bucket_start(b) is the lowest score in bucket b.
+CREATE OR REPLACE FUNCTION rank_bucket(score NUMERIC) RETURNS BIGINT AS $$
+  SELECT floor(score / 100)::bigint;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION rank_bucket_start(bucket BIGINT) RETURNS NUMERIC AS $$
+  SELECT bucket * 100::numeric;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Replaces the single-row UserCount from 0007.
+DROP TABLE IF EXISTS UserCount;
+CREATE TABLE IF NOT EXISTS UserCountShards (
+  Shard INT PRIMARY KEY,
+  Total BIGINT NOT NULL DEFAULT 0
+);
+
+-- Metric is a UserTotals column name: SavingsTotal, ExpensesTotal or NetWorth.
+CREATE TABLE IF NOT EXISTS RankHistogram (
+  Metric TEXT NOT NULL,
+  Bucket BIGINT NOT NULL,
+  Shard INT NOT NULL,
+  Users BIGINT NOT NULL DEFAULT 0,
+  PRIMARY KEY (Metric, Bucket, Shard)
+);
+
+CREATE OR REPLACE FUNCTION user_totals_on_user_insert() RETURNS TRIGGER AS $$
+BEGIN
+  INSERT INTO UserTotals (UserID) VALUES (NEW.UserID) ON CONFLICT (UserID) DO NOTHING;
+  INSERT INTO UserCountShards (Shard, Total) VALUES (NEW.UserID % 16, 1)
+  ON CONFLICT (Shard) DO UPDATE SET Total = UserCountShards.Total + 1;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION user_count_on_user_delete() RETURNS TRIGGER AS $$
+BEGIN
+  UPDATE UserCountShards SET Total = Total - 1 WHERE Shard = OLD.UserID % 16;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Moves one user between buckets of one metric; a NULL bucket means "not counted".
+-- Bucket rows are always touched in ascending order (and metrics in a fixed order by
+-- the caller), so two users crossing the same boundary in opposite directions can't deadlock.
+CREATE OR REPLACE FUNCTION rank_histogram_move(p_metric TEXT, p_shard INT, p_old BIGINT, p_new BIGINT) RETURNS VOID AS $$
+DECLARE
+  v_bucket BIGINT;
+BEGIN
+  IF p_old IS NOT DISTINCT FROM p_new THEN
+    RETURN;
+  END IF;
+  FOR v_bucket IN SELECT b FROM unnest(ARRAY[p_old, p_new]) AS b WHERE b IS NOT NULL ORDER BY b LOOP
+    INSERT INTO RankHistogram (Metric, Bucket, Shard, Users)
+    VALUES (p_metric, v_bucket, p_shard, CASE WHEN v_bucket = p_new THEN 1 ELSE -1 END)
+    ON CONFLICT (Metric, Bucket, Shard) DO UPDATE SET Users = RankHistogram.Users + EXCLUDED.Users;
+  END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION rank_histogram_on_totals_change() RETURNS TRIGGER AS $$
+DECLARE
+  v_shard INT := COALESCE(NEW.UserID, OLD.UserID) % 16;
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM rank_histogram_move('SavingsTotal', v_shard, NULL, rank_bucket(NEW.SavingsTotal));
+    PERFORM rank_histogram_move('ExpensesTotal', v_shard, NULL, rank_bucket(NEW.ExpensesTotal));
+    PERFORM rank_histogram_move('NetWorth', v_shard, NULL, rank_bucket(NEW.NetWorth));
+  ELSIF TG_OP = 'DELETE' THEN
+    PERFORM rank_histogram_move('SavingsTotal', v_shard, rank_bucket(OLD.SavingsTotal), NULL);
+    PERFORM rank_histogram_move('ExpensesTotal', v_shard, rank_bucket(OLD.ExpensesTotal), NULL);
+    PERFORM rank_histogram_move('NetWorth', v_shard, rank_bucket(OLD.NetWorth), NULL);
+  ELSE
+    PERFORM rank_histogram_move('SavingsTotal', v_shard, rank_bucket(OLD.SavingsTotal), rank_bucket(NEW.SavingsTotal));
+    PERFORM rank_histogram_move('ExpensesTotal', v_shard, rank_bucket(OLD.ExpensesTotal), rank_bucket(NEW.ExpensesTotal));
+    PERFORM rank_histogram_move('NetWorth', v_shard, rank_bucket(OLD.NetWorth), rank_bucket(NEW.NetWorth));
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS rank_histogram_totals_insert_delete ON UserTotals;
+CREATE TRIGGER rank_histogram_totals_insert_delete
+AFTER INSERT OR DELETE ON UserTotals
+FOR EACH ROW EXECUTE FUNCTION rank_histogram_on_totals_change();
+
+-- Most totals updates stay inside their buckets and skip the trigger entirely.
+DROP TRIGGER IF EXISTS rank_histogram_totals_update ON UserTotals;
+CREATE TRIGGER rank_histogram_totals_update
+AFTER UPDATE ON UserTotals
+FOR EACH ROW
+WHEN (rank_bucket(OLD.SavingsTotal) <> rank_bucket(NEW.SavingsTotal)
+   OR rank_bucket(OLD.ExpensesTotal) <> rank_bucket(NEW.ExpensesTotal)
+   OR rank_bucket(OLD.NetWorth) <> rank_bucket(NEW.NetWorth)
+   OR OLD.UserID <> NEW.UserID)
+EXECUTE FUNCTION rank_histogram_on_totals_change();
+
+CREATE OR REPLACE FUNCTION rebuild_rank_histogram() RETURNS VOID AS $$
+BEGIN
+  LOCK TABLE UserTotals IN SHARE MODE;
+  DELETE FROM RankHistogram;
+  INSERT INTO RankHistogram (Metric, Bucket, Shard, Users)
+  SELECT 'SavingsTotal', rank_bucket(SavingsTotal), UserID % 16, COUNT(*) FROM UserTotals GROUP BY 2, 3
+  UNION ALL
+  SELECT 'ExpensesTotal', rank_bucket(ExpensesTotal), UserID % 16, COUNT(*) FROM UserTotals GROUP BY 2, 3
+  UNION ALL
+  SELECT 'NetWorth', rank_bucket(NetWorth), UserID % 16, COUNT(*) FROM UserTotals GROUP BY 2, 3;
+
+  DELETE FROM UserCountShards;
+  INSERT INTO UserCountShards (Shard, Total)
+  SELECT UserID % 16, COUNT(*) FROM Users GROUP BY 1;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Bulk rebuilds skip the per-row histogram trigger and recount once at the end.
+CREATE OR REPLACE FUNCTION rebuild_user_totals() RETURNS VOID AS $$
+BEGIN
+  LOCK TABLE Savings, Expenses IN SHARE MODE;
+  ALTER TABLE UserTotals DISABLE TRIGGER rank_histogram_totals_insert_delete;
+  DELETE FROM UserTotals;
+  INSERT INTO UserTotals (UserID, SavingsTotal, SavingsCount, SavingsMax, SavingsMin,
+                          ExpensesTotal, ExpensesCount, ExpensesMax, ExpensesMin)
+  SELECT u.UserID,
+         COALESCE(s.Total, 0), COALESCE(s.Entries, 0), s.MaxAmount, s.MinAmount,
+         COALESCE(e.Total, 0), COALESCE(e.Entries, 0), e.MaxAmount, e.MinAmount
+  FROM Users u
+  LEFT JOIN (
+    SELECT UserID, SUM(Amount) AS Total, COUNT(*) AS Entries, MAX(Amount) AS MaxAmount, MIN(Amount) AS MinAmount
+    FROM Savings GROUP BY UserID
+  ) s ON s.UserID = u.UserID
+  LEFT JOIN (
+    SELECT UserID, SUM(Amount) AS Total, COUNT(*) AS Entries, MAX(Amount) AS MaxAmount, MIN(Amount) AS MinAmount
+    FROM Expenses GROUP BY UserID
+  ) e ON e.UserID = u.UserID;
+  ALTER TABLE UserTotals ENABLE TRIGGER rank_histogram_totals_insert_delete;
+  PERFORM rebuild_rank_histogram();
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT rebuild_rank_histogram();
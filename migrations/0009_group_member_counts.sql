@@ -0,0 +1,37 @@
+-- Moves member counts off Groups into their own narrow table. Every join or leave
+-- used to update the group's row, which rewrote its stored SearchVector and queued
+-- behind edits and contribution compaction on the same row. Joins now only touch
+-- GroupMemberCounts, and discovery pages read it with one index lookup per group.
+CREATE TABLE IF NOT EXISTS GroupMemberCounts (
+  GroupID INT PRIMARY KEY,
+  Members INT NOT NULL DEFAULT 0,
+  FOREIGN KEY (GroupID) REFERENCES Groups(GroupID) ON DELETE CASCADE
+);
+
+CREATE OR REPLACE FUNCTION group_member_count_on_change() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    UPDATE GroupMemberCounts SET Members = Members - 1 WHERE GroupID = OLD.GroupID;
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    INSERT INTO GroupMemberCounts (GroupID, Members) VALUES (NEW.GroupID, 1)
+    ON CONFLICT (GroupID) DO UPDATE SET Members = GroupMemberCounts.Members + 1;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recounts every group's members, e.g. after bulk loads into UserGroups.
+CREATE OR REPLACE FUNCTION rebuild_group_member_counts() RETURNS VOID AS $$
+BEGIN
+  LOCK TABLE UserGroups IN SHARE MODE;
+  DELETE FROM GroupMemberCounts;
+  INSERT INTO GroupMemberCounts (GroupID, Members)
+  SELECT GroupID, COUNT(*) FROM UserGroups GROUP BY GroupID;
+END;
+$$ LANGUAGE plpgsql;
+
+ALTER TABLE Groups DROP COLUMN IF EXISTS MemberCount;
+
+SELECT rebuild_group_member_counts();
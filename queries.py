@@ -0,0 +1,378 @@
+import math
+import re
+
+# SQL text and parameter builders shared by Project.Database (psycopg2) and
+# async_database.AsyncDatabase (psycopg 3). Both drivers take the same %s and
+# %(name)s placeholders, so each query is written once here and the two classes
+# only differ in how they run it. Nothing here imports a driver.
+
+RANK_METRIC_COLUMNS = {"savings": "SavingsTotal", "expenses": "ExpensesTotal", "net_worth": "NetWorth"}
+SERIES_BUCKETS = ("day", "week", "month")
+SERIES_BUCKET_ORIGIN = "2000-01-03"  # a Monday; fixed-width day buckets are aligned to it
+DISCOVERY_PAGE_SIZE = 100
+SEARCH_RESULT_LIMIT = 100
+CONTRIBUTION_HISTORY_PAGE_SIZE = 100
+SEARCH_WORD_PATTERN = re.compile(r"\w+")
+
+
+def discovery_parameters(user_id, limit, after, prefix):
+    # Query parameters for the keyset-paginated group and challenge listings. after is
+    # (name, id) of the last row already shown; the prefix is escaped so % and _ match literally.
+    after_name, after_id = after if after is not None else (None, None)
+    pattern = None
+    if prefix:
+        pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    return {"user_id": user_id, "limit": limit, "after_name": after_name, "after_id": after_id, "pattern": pattern}
+
+
+def search_query(text):
+    # Turns free text into a tsquery where every word must match as a prefix, e.g.
+    # "beach trip" -> "beach:* & trip:*". Only word characters reach to_tsquery, so
+    # user input can never be a tsquery syntax error. Returns None when there are no words.
+    words = SEARCH_WORD_PATTERN.findall(text.lower())
+    return " & ".join(f"{word}:*" for word in words) or None
+
+
+def search_parameters(user_id, query, limit):
+    return {"user_id": user_id, "query": query, "limit": limit}
+
+
+USER_INFO = "SELECT * FROM Users WHERE UserID = %s"
+
+LOGIN_USER = "SELECT UserID, Password FROM Users WHERE Email = %s"
+
+USER_CHALLENGES = """
+    SELECT c.ChallengeID, c.Name, c.BriefDescription, c.StartDate, c.EndDate, c.TargetAmount
+    FROM Challenges c
+    INNER JOIN UserChallenges uc ON c.ChallengeID = uc.ChallengeID
+    WHERE uc.UserID = %s;
+"""
+
+
+def challenges_not_joined_query(after, prefix):
+    # Pages walk idx_challenges_name_key in (lower(Name), ChallengeID) order
+    conditions = ""
+    if after is not None:
+        conditions += ' AND (lower(c.Name) COLLATE "C", c.ChallengeID) > (lower(%(after_name)s) COLLATE "C", %(after_id)s)'
+    if prefix:
+        conditions += ' AND lower(c.Name) COLLATE "C" LIKE lower(%(pattern)s)'
+    return f"""
+        SELECT c.ChallengeID, c.Name, c.BriefDescription, c.StartDate, c.EndDate, c.TargetAmount
+        FROM Challenges c
+        WHERE NOT EXISTS (
+            SELECT 1 FROM UserChallenges uc WHERE uc.UserID = %(user_id)s AND uc.ChallengeID = c.ChallengeID
+        ){conditions}
+        ORDER BY lower(c.Name) COLLATE "C", c.ChallengeID
+        LIMIT %(limit)s;
+    """
+
+
+SEARCH_CHALLENGES = """
+    SELECT c.ChallengeID, c.Name, c.BriefDescription, c.StartDate, c.EndDate, c.TargetAmount
+    FROM Challenges c, to_tsquery('simple', %(query)s) q
+    WHERE c.SearchVector @@ q
+      AND NOT EXISTS (
+        SELECT 1 FROM UserChallenges uc WHERE uc.UserID = %(user_id)s AND uc.ChallengeID = c.ChallengeID
+      )
+    ORDER BY ts_rank(c.SearchVector, q) DESC, c.ChallengeID
+    LIMIT %(limit)s;
+"""
+
+GROUP_GOALS = """
+    SELECT g.GroupID, g.GroupName, g.GroupGoal, g.CurrentGroupSavings + COALESCE(p.Pending, 0)
+    FROM Groups g
+    INNER JOIN UserGroups ug ON g.GroupID = ug.GroupID
+    CROSS JOIN LATERAL (
+        SELECT SUM(gc.Amount) AS Pending FROM GroupContributions gc
+        WHERE gc.GroupID = g.GroupID AND NOT gc.Compacted
+    ) p
+    WHERE ug.UserID = %s;
+"""
+
+
+def groups_not_joined_query(after, prefix):
+    # Same paging as challenges_not_joined_query, in (lower(GroupName), GroupID) order
+    conditions = ""
+    if after is not None:
+        conditions += ' AND (lower(g.GroupName) COLLATE "C", g.GroupID) > (lower(%(after_name)s) COLLATE "C", %(after_id)s)'
+    if prefix:
+        conditions += ' AND lower(g.GroupName) COLLATE "C" LIKE lower(%(pattern)s)'
+    return f"""
+        SELECT g.GroupID, g.GroupName, g.Description, g.GroupGoal, COALESCE(mc.Members, 0)
+        FROM Groups g
+        LEFT JOIN GroupMemberCounts mc ON mc.GroupID = g.GroupID
+        WHERE NOT EXISTS (
+            SELECT 1 FROM UserGroups ug WHERE ug.UserID = %(user_id)s AND ug.GroupID = g.GroupID
+        ){conditions}
+        ORDER BY lower(g.GroupName) COLLATE "C", g.GroupID
+        LIMIT %(limit)s;
+    """
+
+
+SEARCH_GROUPS = """
+    SELECT g.GroupID, g.GroupName, g.Description, g.GroupGoal, COALESCE(mc.Members, 0)
+    FROM Groups g
+    CROSS JOIN to_tsquery('simple', %(query)s) q
+    LEFT JOIN GroupMemberCounts mc ON mc.GroupID = g.GroupID
+    WHERE g.SearchVector @@ q
+      AND NOT EXISTS (
+        SELECT 1 FROM UserGroups ug WHERE ug.UserID = %(user_id)s AND ug.GroupID = g.GroupID
+      )
+    ORDER BY ts_rank(g.SearchVector, q) DESC, g.GroupID
+    LIMIT %(limit)s;
+"""
+
+CREATE_GROUP = """
+    INSERT INTO Groups (GroupName, Description, GroupGoal, CurrentGroupSavings, OwnerID)
+    VALUES (%s, %s, %s, 0.00, %s)
+    RETURNING GroupID, GroupName, GroupGoal, CurrentGroupSavings;
+"""
+
+# Only the owner's UPDATE matches a row; it comes back shaped like a GROUP_GOALS row
+EDIT_GROUP = """
+    UPDATE Groups SET GroupName = %s, Description = %s, GroupGoal = %s
+    WHERE GroupID = %s AND OwnerID = %s
+    RETURNING GroupID, GroupName, GroupGoal, CurrentGroupSavings + COALESCE((
+        SELECT SUM(gc.Amount) FROM GroupContributions gc
+        WHERE gc.GroupID = Groups.GroupID AND NOT gc.Compacted
+    ), 0);
+"""
+
+DELETE_GROUP = "DELETE FROM Groups WHERE GroupID = %s AND OwnerID = %s RETURNING GroupID;"
+
+ADD_USER_TO_GROUP = "INSERT INTO UserGroups (UserID, GroupID) VALUES (%s, %s);"
+
+ADD_USER_TO_CHALLENGE = "INSERT INTO UserChallenges (UserID, ChallengeID) VALUES (%s, %s);"
+
+REMOVE_USER_FROM_CHALLENGE = "DELETE FROM UserChallenges WHERE UserID = %s and ChallengeID = %s RETURNING ChallengeID;"
+
+# The insert is not visible to the statement's own snapshot, so its amount is added
+# to the pending sum explicitly
+ADD_CONTRIBUTION_TO_GROUP = """
+    WITH added AS (
+        INSERT INTO GroupContributions (GroupID, UserID, Amount) VALUES (%(group_id)s, %(user_id)s, %(amount)s)
+        RETURNING GroupID, Amount
+    )
+    SELECT g.GroupID, g.GroupName, g.GroupGoal, g.CurrentGroupSavings + a.Amount + COALESCE((
+        SELECT SUM(gc.Amount) FROM GroupContributions gc
+        WHERE gc.GroupID = g.GroupID AND NOT gc.Compacted
+    ), 0)
+    FROM added a
+    INNER JOIN Groups g ON g.GroupID = a.GroupID;
+"""
+
+GROUP_CONTRIBUTIONS = """
+    SELECT gc.ContributionID, gc.UserID, u.FirstName, u.LastName, gc.Amount, gc.ContributedAt
+    FROM GroupContributions gc
+    LEFT JOIN Users u ON u.UserID = gc.UserID
+    WHERE gc.GroupID = %(group_id)s
+      AND (%(before)s::bigint IS NULL OR gc.ContributionID < %(before)s)
+    ORDER BY gc.ContributionID DESC
+    LIMIT %(limit)s;
+"""
+
+GROUP_MEMBER_CONTRIBUTIONS = """
+    SELECT t.UserID, u.FirstName, u.LastName, t.Total, t.Contributions
+    FROM (
+        SELECT UserID, SUM(Amount) AS Total, COUNT(*) AS Contributions
+        FROM GroupContributions
+        WHERE GroupID = %s
+        GROUP BY UserID
+    ) t
+    LEFT JOIN Users u ON u.UserID = t.UserID
+    ORDER BY t.Total DESC, t.UserID;
+"""
+
+COMPACT_GROUP_CONTRIBUTIONS = "SELECT compact_group_contributions(%s);"
+
+GROUP_NAME = "SELECT GroupName FROM Groups WHERE GroupID = %s"
+
+
+def leaderboard_query(total_column):
+    # total_column is always a UserTotals column, never user input. Ranks come from a
+    # window function and rows are cut with LIMIT/OFFSET, so the (total DESC, UserID)
+    # indexes let Postgres stop after limit + offset rows.
+    return f"""
+        SELECT RANK() OVER (ORDER BY ut.{total_column} DESC) AS Rank,
+               u.UserID, u.FirstName, u.LastName, ut.{total_column}
+        FROM UserTotals ut
+        INNER JOIN Users u ON u.UserID = ut.UserID
+        ORDER BY ut.{total_column} DESC, ut.UserID
+        LIMIT %s OFFSET %s;
+    """
+
+
+def user_rank_query(column):
+    # Takes (column, user_id). Users in higher score buckets are summed from
+    # RankHistogram; only the user's own bucket is counted row by row on the metric's
+    # UserTotals index. The user total is the sum of the UserCountShards rows.
+    return f"""
+        SELECT (SELECT COALESCE(SUM(h.Users), 0) FROM RankHistogram h
+                WHERE h.Metric = %s AND h.Bucket > rank_bucket(me.{column}))
+             + (SELECT COUNT(*) FROM UserTotals o
+                WHERE o.{column} > me.{column}
+                  AND o.{column} < rank_bucket_start(rank_bucket(me.{column}) + 1))
+             + 1 AS Rank,
+               (SELECT COALESCE(SUM(Total), 0) FROM UserCountShards) AS TotalUsers
+        FROM UserTotals me
+        WHERE me.UserID = %s;
+    """
+
+
+def rank_percentile(rank, total_users):
+    return (total_users - rank) / (total_users - 1) * 100 if total_users > 1 else 100.0
+
+
+TOTAL_NUMBER_OF_USERS = "SELECT COALESCE(SUM(Total), 0) FROM UserCountShards;"
+
+CREATE_USER = (
+    "INSERT INTO Users (FirstName, LastName, Email, Password, DateJoined) "
+    "VALUES (%s, %s, %s, %s, CURRENT_DATE) RETURNING UserID;"
+)
+
+ADD_NEW_SAVING = "INSERT INTO Savings (UserID, Amount, Purpose, Date) VALUES (%s, %s, %s, CURRENT_DATE) RETURNING SavingsID;"
+
+DELETE_SAVING = "DELETE FROM Savings WHERE UserID = %s AND SavingsID = %s;"
+
+EDIT_SAVING = "UPDATE Savings SET Amount = %s, Purpose = %s WHERE UserID = %s AND SavingsID = %s;"
+
+ADD_NEW_EXPENSE = "INSERT INTO Expenses (UserID, Amount, Category, Date) VALUES (%s, %s, %s, CURRENT_DATE)"
+
+DELETE_EXPENSE = "DELETE FROM Expenses WHERE UserID = %s AND ExpenseID = %s"
+
+EDIT_EXPENSE = "UPDATE Expenses SET Amount = %s, Category = %s WHERE UserID = %s AND ExpenseID = %s"
+
+
+def sorted_entries_query(table, sort_by, order):
+    # table is Savings or Expenses, named by the callers
+    sort_column = 'Amount' if sort_by == 'amount' else 'Date'
+    order_by = 'DESC' if order == 'desc' else 'ASC'
+    return f"SELECT * FROM {table} WHERE UserID = %s ORDER BY {sort_column} {order_by}"
+
+
+def transactions_query(user_id, sort_by, order, filter_type, limit, offset):
+    # Savings and expenses as one feed of (Type, ID, Amount, Purpose/Category, Date) rows,
+    # merged, sorted and paginated by the database. Returns (query, params), or None when
+    # filter_type selects neither table.
+    branches = []
+    params = []
+    if filter_type in ['both', 'savings']:
+        branches.append("SELECT 'Saving' AS Type, SavingsID AS ID, Amount, Purpose AS Detail, Date FROM Savings WHERE UserID = %s")
+        params.append(user_id)
+    if filter_type in ['both', 'expenses']:
+        branches.append("SELECT 'Expense' AS Type, ExpenseID AS ID, Amount, Category AS Detail, Date FROM Expenses WHERE UserID = %s")
+        params.append(user_id)
+    if not branches:
+        return None
+
+    sort_column = 'Amount' if sort_by == 'amount' else 'Date'
+    order_by = 'DESC' if order == 'desc' else 'ASC'
+    query = (
+        "SELECT Type, ID, Amount, Detail, Date FROM ("
+        + " UNION ALL ".join(branches)
+        + f") feed ORDER BY {sort_column} {order_by}, Type, ID LIMIT %s OFFSET %s"
+    )
+    return query, params + [limit, offset]
+
+
+def user_total_query(column):
+    # column is always a UserTotals column named by the callers
+    return f"SELECT {column} FROM UserTotals WHERE UserID = %s"
+
+
+HIGHEST_AND_LOWEST_SAVINGS = "SELECT SavingsMax, SavingsMin FROM UserTotals WHERE UserID = %s"
+
+HIGHEST_AND_LOWEST_EXPENSES = "SELECT ExpensesMax, ExpensesMin FROM UserTotals WHERE UserID = %s"
+
+USER_STATS_SNAPSHOT = """
+    SELECT SavingsTotal, ExpensesTotal, NetWorth, SavingsMax, SavingsMin,
+           ExpensesMax, ExpensesMin, SavingsCount, ExpensesCount
+    FROM UserTotals WHERE UserID = %s;
+"""
+
+
+def user_stats_snapshot(row):
+    row = row or (0, 0, 0, None, None, None, None, 0, 0)
+    return {
+        'total_savings': row[0],
+        'total_expenses': row[1],
+        'net_worth': row[2],
+        'highest_savings': row[3],
+        'lowest_savings': row[4],
+        'highest_expenses': row[5],
+        'lowest_expenses': row[6],
+        'savings_entries': row[7],
+        'expenses_entries': row[8],
+    }
+
+
+SAVINGS_EXPENSES_SPAN = """
+    SELECT LEAST((SELECT MIN(Date) FROM Savings WHERE UserID = %(user_id)s),
+                 (SELECT MIN(Date) FROM Expenses WHERE UserID = %(user_id)s)),
+           GREATEST((SELECT MAX(Date) FROM Savings WHERE UserID = %(user_id)s),
+                    (SELECT MAX(Date) FROM Expenses WHERE UserID = %(user_id)s));
+"""
+
+
+def downsample_range(span, max_points, start, end):
+    # Clamps start/end to the (first, last) span and picks a bucket wide enough that at
+    # most max_points come back. Returns (bucket, start, end), or None if nothing is in range.
+    first, last = span
+    if first is None:
+        return None
+    start = max(start, first) if start is not None else first
+    end = min(end, last) if end is not None else last
+    if start > end:
+        return None
+    step_days = max(1, math.ceil(((end - start).days + 1) / max_points))
+    return (step_days if step_days > 1 else 'day'), start, end
+
+
+def series_query(user_id, bucket, cumulative, start, end):
+    # Returns (query, params) for [(bucket_date, savings, expenses), ...] over buckets with
+    # any activity. Each table is summed per bucket on its own (UserID, Date) index before
+    # the two are merged, so a day with several savings and expenses is counted once.
+    # Cumulative series include everything before start, then only the requested range is
+    # returned. bucket is 'day', 'week', 'month' or a bucket width in days.
+    if isinstance(bucket, int) and bucket > 0:
+        # Postgres % truncates toward zero, so the remainder is floored to keep dates
+        # before the origin in the bucket that starts on or before them
+        bucket_expression = "Date - ((((Date - %(origin)s::date) %% %(bucket)s) + %(bucket)s) %% %(bucket)s)"
+    elif bucket in SERIES_BUCKETS:
+        bucket_expression = "date_trunc(%(bucket)s, Date::timestamp)::date"
+    else:
+        raise ValueError(f"Unknown bucket {bucket!r}, expected a number of days or one of {', '.join(SERIES_BUCKETS)}.")
+    totals = "SUM(Savings) OVER (ORDER BY Bucket), SUM(Expenses) OVER (ORDER BY Bucket)" if cumulative else "Savings, Expenses"
+    date_range = ""
+    if start is not None and not cumulative:
+        date_range += " AND Date >= %(start)s"
+    if end is not None:
+        date_range += " AND Date <= %(end)s"
+    query = f"""
+        WITH SavingsBuckets AS (
+            SELECT {bucket_expression} AS Bucket, SUM(Amount) AS Total
+            FROM Savings
+            WHERE UserID = %(user_id)s{date_range}
+            GROUP BY 1
+        ), ExpenseBuckets AS (
+            SELECT {bucket_expression} AS Bucket, SUM(Amount) AS Total
+            FROM Expenses
+            WHERE UserID = %(user_id)s{date_range}
+            GROUP BY 1
+        ), Merged AS (
+            SELECT COALESCE(s.Bucket, e.Bucket) AS Bucket,
+                   COALESCE(s.Total, 0) AS Savings, COALESCE(e.Total, 0) AS Expenses
+            FROM SavingsBuckets s
+            FULL JOIN ExpenseBuckets e ON s.Bucket = e.Bucket
+        ), Series AS (
+            SELECT Bucket, {totals} FROM Merged
+        )
+        SELECT * FROM Series
+        WHERE %(start)s::date IS NULL
+           OR Bucket >= (SELECT {bucket_expression} FROM (SELECT %(start)s::date AS Date) AS RangeStart)
+        ORDER BY Bucket;
+    """
+    return query, {"user_id": user_id, "bucket": bucket, "origin": SERIES_BUCKET_ORIGIN, "start": start, "end": end}
+
+
+USER_NET_SAVINGS = "SELECT SavingsTotal, ExpensesTotal FROM UserTotals WHERE UserID = %s;"